@@ -0,0 +1,73 @@
+"""
+Compares the throughput of each installed JSON decoder when deserializing
+query responses with `Measurement.from_json`, e.g.
+
+    python benchmarks/json_decoding.py --rows 1000000
+"""
+import argparse
+import importlib
+import json
+
+import numpy as np
+
+from canal import responses
+
+from line_protocol import IMU, timed
+
+
+def make_response(num_rows, epoch=None):
+    imu = IMU(
+        time=np.arange(num_rows).astype("datetime64[ms]"),
+        accelerometer_x=np.random.randint(-2**15, 2**15, num_rows),
+        accelerometer_y=np.random.randint(-2**15, 2**15, num_rows),
+        accelerometer_z=np.random.randint(-2**15, 2**15, num_rows),
+        gyroscope_x=np.random.randn(num_rows),
+        gyroscope_y=np.random.randn(num_rows),
+        gyroscope_z=np.random.randn(num_rows),
+        user_id=np.random.randint(0, 100, num_rows).astype(str)
+    )
+    data_frame = imu.data_frame
+    if epoch is None:
+        times = np.datetime_as_string(data_frame["time"].values, unit="ns")
+        times = [time + "Z" for time in times.tolist()]
+    else:
+        times = data_frame["time"].values.view(np.int64).tolist()
+    columns = [name for name in data_frame.columns if name != "time"]
+    values = [
+        list(row) for row in zip(times, *(
+            data_frame[name].values.tolist() for name in columns
+        ))
+    ]
+    return json.dumps(dict(results=[dict(
+        statement_id=0,
+        series=[dict(name="IMU", columns=["time"] + columns, values=values)]
+    )])).encode()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1000000)
+    args = parser.parse_args()
+
+    default = responses.json_backend()
+    for epoch in [None, "ns"]:
+        payload = make_response(args.rows, epoch)
+        print("{} timestamps, {:.0f} MB".format(
+            "RFC3339" if epoch is None else "Integer",
+            len(payload) / 2**20
+        ))
+        for name in responses.JSON_BACKENDS:
+            try:
+                loads = importlib.import_module(name).loads
+            except ImportError:
+                print("  {:<9} not installed".format(name))
+                continue
+            responses._json_decoder = name, loads
+            _, decode = timed(responses.json_loads, payload)
+            _, elapsed = timed(IMU.from_json, payload, epoch)
+            print("  {:<9} loads: {:>10.0f} points/s, from_json: {:>10.0f} points/s".format(
+                name,
+                args.rows / decode,
+                args.rows / elapsed
+            ))
+    print("Default backend: {}".format(default))
@@ -0,0 +1,52 @@
+"""
+Compares the throughput of line protocol serialization and parsing, e.g.
+
+    python benchmarks/line_protocol.py --rows 1000000
+"""
+import argparse
+import time
+
+import numpy as np
+
+import canal
+
+
+class IMU(canal.Measurement):
+    accelerometer_x = canal.IntegerField()
+    accelerometer_y = canal.IntegerField()
+    accelerometer_z = canal.IntegerField()
+    gyroscope_x = canal.FloatField()
+    gyroscope_y = canal.FloatField()
+    gyroscope_z = canal.FloatField()
+    user_id = canal.Tag()
+
+
+def make_imu(num_rows):
+    return IMU(
+        time=np.arange(num_rows).astype("datetime64[ms]"),
+        accelerometer_x=np.random.randint(-2**15, 2**15, num_rows),
+        accelerometer_y=np.random.randint(-2**15, 2**15, num_rows),
+        accelerometer_z=np.random.randint(-2**15, 2**15, num_rows),
+        gyroscope_x=np.random.randn(num_rows),
+        gyroscope_y=np.random.randn(num_rows),
+        gyroscope_z=np.random.randn(num_rows),
+        user_id=np.random.randint(0, 100, num_rows)
+    )
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1000000)
+    args = parser.parse_args()
+
+    imu = make_imu(args.rows)
+    payload, elapsed = timed(imu.to_line_protocol_bytes)
+    print("serialize: {:>12.0f} points/s".format(args.rows / elapsed))
+    _, elapsed = timed(IMU.from_line_protocol, payload)
+    print("parse:     {:>12.0f} points/s".format(args.rows / elapsed))
@@ -0,0 +1,36 @@
+"""
+Measures how line protocol serialization scales with the number of worker
+processes, e.g.
+
+    python benchmarks/parallel_serialization.py --rows 2000000
+"""
+import argparse
+import multiprocessing
+import time
+
+from line_protocol import make_imu
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=multiprocessing.cpu_count()
+    )
+    args = parser.parse_args()
+
+    imu = make_imu(args.rows)
+    print("{:>8} {:>12} {:>8}".format("workers", "points/s", "speedup"))
+    for workers in [None] + list(range(1, args.max_workers + 1)):
+        start = time.perf_counter()
+        imu.to_line_protocol(workers=workers)
+        rate = args.rows / (time.perf_counter() - start)
+        if workers is None:
+            baseline = rate
+        print("{:>8} {:>12.0f} {:>7.2f}x".format(
+            str(workers or "serial"),
+            rate,
+            rate / baseline
+        ))
@@ -1,3 +1,5 @@
+from .backends import set_default_backend
+from .batch import Batch
 from .datum import Tag, FloatField, IntegerField, BooleanField, StringField
 from .exceptions import MissingFieldError, MissingTagError
 from .measurement import Measurement
@@ -0,0 +1,290 @@
+"""
+The columnar storage backing measurements.  Serialization only relies on the
+`Columns` interface, so measurements may be stored either in a pandas
+dataframe, or in plain NumPy arrays when pandas isn't needed, e.g. by
+producers writing many small batches of points
+"""
+import abc
+import collections
+
+import numpy as np
+
+from . import util
+
+pd = util.LazyModule("pandas")
+
+
+class Columns(metaclass=abc.ABCMeta):
+    """
+    The columns of a measurement instance: its tags, its fields and `time`,
+    all of the same length
+    """
+
+    @classmethod
+    @abc.abstractmethod
+    def from_columns(cls, columns):
+        """
+        :param columns: An ordered mapping of column names to columns, as
+            returned by `coerce` and `empty`
+        :return: A new instance
+        """
+        pass
+
+    @staticmethod
+    @abc.abstractmethod
+    def coerce(datum, values):
+        """
+        Converts an array of values into a column of a tag or field
+
+        :param datum: The `Tag` or `Field` the column holds
+        :param values: A `numpy.ndarray` or other array-like
+        """
+        pass
+
+    @staticmethod
+    @abc.abstractmethod
+    def empty(datum, num_rows):
+        """
+        Allocates a column of a tag or field holding only missing values
+        """
+        pass
+
+    @abc.abstractmethod
+    def __len__(self):
+        pass
+
+    @abc.abstractmethod
+    def __getitem__(self, name):
+        """
+        Returns a column as it is stored, e.g. for serialization
+        """
+        pass
+
+    @abc.abstractmethod
+    def __setitem__(self, name, values):
+        pass
+
+    def values(self, name):
+        """
+        Returns a column as it is read through a measurement's attributes
+        """
+        return self[name]
+
+    @abc.abstractmethod
+    def take(self, rows):
+        """
+        Selects a subset of rows
+
+        :param rows: A slice, or an array of row indices
+        :return: A new instance of the same class
+        """
+        pass
+
+    @abc.abstractmethod
+    def to_data_frame(self):
+        pass
+
+    @abc.abstractmethod
+    def to_records(self):
+        pass
+
+
+class FrameColumns(Columns):
+    """
+    Columns stored within a `pandas.DataFrame`.  Columns are coerced into
+    their datums' dtypes, i.e. nullable integers, and categorical tags
+    """
+
+    def __init__(self, data_frame):
+        self._data_frame = data_frame
+
+    @classmethod
+    def from_columns(cls, columns):
+        return cls(pd.DataFrame(columns, columns=list(columns)))
+
+    @staticmethod
+    def coerce(datum, values):
+        if isinstance(values, CodedColumn):
+            values = pd.Categorical.from_codes(values.codes, values.categories)
+        return datum.to_column(values)
+
+    @staticmethod
+    def empty(datum, num_rows):
+        return datum.empty_column(num_rows)
+
+    def __len__(self):
+        return len(self._data_frame)
+
+    def __getitem__(self, name):
+        return self._data_frame[name].values
+
+    def __setitem__(self, name, values):
+        self._data_frame[name] = values
+
+    def values(self, name):
+        values = self[name]
+        if isinstance(values, pd.Categorical):
+            # Tags are stored as categoricals, but read as arrays of strings,
+            # with `None` for missing values
+            return decode_categorical(values)
+        return values
+
+    def take(self, rows):
+        return FrameColumns(self._data_frame.iloc[rows])
+
+    def to_data_frame(self):
+        return self._data_frame
+
+    def to_records(self):
+        return self._data_frame.to_records(index=False)
+
+
+class ArrayColumns(Columns):
+    """
+    Columns stored as plain `numpy.ndarray` instances, without pandas.
+    Columns holding missing values, other than floats, have an object dtype,
+    with `None` marking the missing values
+    """
+
+    def __init__(self, columns, num_rows):
+        self._columns = columns
+        self._num_rows = num_rows
+
+    @classmethod
+    def from_columns(cls, columns):
+        lengths = set(len(values) for values in columns.values())
+        if len(lengths) > 1:
+            raise ValueError("Columns must all be the same length")
+        return cls(collections.OrderedDict(columns), lengths.pop() if lengths else 0)
+
+    @staticmethod
+    def coerce(datum, values):
+        if not isinstance(values, np.ndarray):
+            values = _to_ndarray(values)
+        return datum.to_ndarray(values)
+
+    @staticmethod
+    def empty(datum, num_rows):
+        if datum.dtype.kind == "f":
+            return np.full(num_rows, np.nan)
+        return np.full(num_rows, None, dtype=object)
+
+    def __len__(self):
+        return self._num_rows
+
+    def __getitem__(self, name):
+        return self._columns[name]
+
+    def __setitem__(self, name, values):
+        if len(values) != self._num_rows:
+            raise ValueError("Length of values does not match length of columns")
+        self._columns[name] = values
+
+    def take(self, rows):
+        columns = collections.OrderedDict(
+            (name, values[rows]) for name, values in self._columns.items()
+        )
+        num_rows = len(next(iter(columns.values()))) if columns else 0
+        return ArrayColumns(columns, num_rows)
+
+    def to_data_frame(self):
+        """
+        Converts the columns into a new `pandas.DataFrame`, on demand.  Unlike
+        the pandas backend's, changes to the dataframe are not reflected by
+        the measurement
+        """
+        return pd.DataFrame(self._columns, columns=list(self._columns))
+
+    def to_records(self):
+        return np.rec.fromarrays(
+            list(self._columns.values()),
+            names=list(self._columns)
+        )
+
+
+class CodedColumn(object):
+    """
+    A column of few distinct values, held as integer codes into its
+    `categories`, -1 marking missing values, e.g. the tags a query response
+    was grouped by.  Each backend builds its own kind of column from it, so
+    that decoding it doesn't require pandas
+    """
+
+    ndim = 1
+
+    def __init__(self, codes, categories):
+        self.codes = codes
+        self.categories = categories
+
+    def __len__(self):
+        return len(self.codes)
+
+    def decode(self):
+        """
+        Converts the column into an object array, holding `None` for missing
+        values
+        """
+        categories = np.empty(len(self.categories) + 1, dtype=object)
+        categories[:-1] = self.categories
+        return categories[self.codes]
+
+
+def decode_categorical(values):
+    """
+    Converts a `pandas.Categorical` into an object array, holding `None` for
+    missing values
+    """
+    categories = np.append(values.categories.values.astype(object), None)
+    return categories[values.codes]
+
+
+def _to_ndarray(values):
+    if isinstance(values, (list, tuple)):
+        return np.asarray(values)
+    if isinstance(values, CodedColumn):
+        return values.decode()
+    if isinstance(values, pd.Categorical):
+        return decode_categorical(values)
+    if isinstance(values, pd.arrays.IntegerArray):
+        column = np.asarray(values, dtype=object)
+        column[np.asarray(values.isna())] = None
+        return column
+    return np.asarray(values)
+
+
+#: The available backends, by name
+BACKENDS = collections.OrderedDict([
+    ("pandas", FrameColumns),
+    ("numpy", ArrayColumns),
+])
+
+_default_backend = "pandas"
+
+
+def get_backend(name=None):
+    """
+    Returns the `Columns` class of a backend
+
+    :param name: The name of the backend, or `None` for the default backend
+    """
+    if name is None:
+        name = _default_backend
+    try:
+        return BACKENDS[name]
+    except KeyError:
+        raise ValueError("Unrecognized backend {}, expected one of {}".format(
+            name,
+            ", ".join(BACKENDS)
+        ))
+
+
+def set_default_backend(name):
+    """
+    Sets the backend of every measurement class which doesn't set its own
+    `BACKEND`
+
+    :param name: The name of the backend, one of `BACKENDS`
+    """
+    global _default_backend
+    get_backend(name)
+    _default_backend = name
@@ -0,0 +1,123 @@
+import itertools
+
+import numpy as np
+
+from . import line_protocol, util
+
+
+class Batch(object):
+    """
+    A collection of measurements, of any mix of measurement classes, which are
+    serialized together into shared payloads.  Each write can then be filled
+    up to its optimal size, however many classes contributed points to it
+    """
+
+    def __init__(self, measurements=()):
+        """
+        :param measurements: An iterable of `Measurement` instances
+        """
+        self._measurements = list(measurements)
+
+    def __len__(self):
+        return sum(len(measurement) for measurement in self._measurements)
+
+    @property
+    def measurements(self):
+        return list(self._measurements)
+
+    def add(self, measurement):
+        """
+        Adds a `Measurement` instance to this batch
+        """
+        self._measurements.append(measurement)
+
+    def clear(self):
+        """
+        Removes every measurement from this batch
+        """
+        del self._measurements[:]
+
+    def _iter_windows(self, window, precision):
+        return itertools.chain.from_iterable(
+            line_protocol.iter_windows(
+                measurement._serializer,
+                measurement._columns,
+                window,
+                precision=precision
+            )
+            for measurement in self._measurements
+        )
+
+    def _iter_interleaved_windows(self, window, precision):
+        # Order every point of every measurement by time, ties (and points
+        # without a timestamp) keeping the order in which they were added
+        times = [
+            measurement._columns["time"]
+            for measurement in self._measurements
+        ]
+        order = np.argsort(np.concatenate([
+            time.view(np.int64) if time.dtype.kind == "M" else
+            np.full(len(time), np.iinfo(np.int64).min, dtype=np.int64)
+            for time in times
+        ]), kind="mergesort")
+        sources = np.repeat(np.arange(len(times)), [len(time) for time in times])
+        rows = np.concatenate([np.arange(len(time)) for time in times])
+
+        for start in range(0, len(order), window):
+            window_sources = sources[order[start:start + window]]
+            window_rows = rows[order[start:start + window]]
+            lines = np.empty(len(window_sources), dtype=object)
+            for source in np.unique(window_sources):
+                measurement = self._measurements[source]
+                selected = window_sources == source
+                lines[selected] = measurement._serializer.format_lines(
+                    measurement._columns.take(window_rows[selected]),
+                    precision
+                )
+            yield lines
+
+    def _windows(self, window, precision, interleave):
+        for measurement in self._measurements:
+            measurement._serializer.check_required(measurement._columns)
+        util.nanoseconds_per(precision)
+
+        if interleave and self._measurements:
+            return self._iter_interleaved_windows(window, precision)
+        return self._iter_windows(window, precision)
+
+    def iter_line_protocol(self, max_lines=5000, max_bytes=None,
+                           precision="ns", interleave=False):
+        """
+        Serializes every measurement within this batch into the InfluxDB line
+        protocol, in shared batches suitable for individual writes
+
+        :param max_lines: The maximum number of points per batch, or `None`
+        :param max_bytes: The maximum UTF-8 encoded size of a batch, or `None`
+        :param precision: The precision of the timestamps
+        :param interleave: Whether to order points by time across every
+            measurement, rather than serializing measurements one after the
+            other
+        :return: A generator of strings
+        """
+        windows = self._windows(
+            max_lines or line_protocol.CHUNK_SIZE,
+            precision,
+            interleave
+        )
+        batches = line_protocol.regroup(windows, max_lines, max_bytes)
+        return ("\n".join(batch.tolist()) for batch in batches)
+
+    def to_line_protocol(self, precision="ns", interleave=False):
+        """
+        Serializes every measurement within this batch into a single InfluxDB
+        line protocol payload
+
+        :param precision: The precision of the timestamps
+        :param interleave: Whether to order points by time across every
+            measurement
+        :return: A string
+        """
+        windows = self._windows(line_protocol.CHUNK_SIZE, precision, interleave)
+        return "\n".join(
+            "\n".join(lines.tolist()) for lines in windows if len(lines)
+        )
@@ -1,7 +1,17 @@
 import abc
+import re
+
+import numpy as np
+
+from . import util
+
+pd = util.LazyModule("pandas")
 
 
 class Datum(metaclass=abc.ABCMeta):
+    #: The dtype of columns holding this kind of datum
+    dtype = np.dtype(object)
+
     def __init__(self, required=False, db_name=None):
         self.required = required
         self.db_name = db_name
@@ -10,33 +20,317 @@ class Datum(metaclass=abc.ABCMeta):
     def format(self, value):
         pass
 
+    def format_array(self, values):
+        """
+        Formats every (non-null) element of an array in a single pass
+
+        Subclasses override this with a vectorized equivalent of `format`, the
+        default simply falls back to formatting one element at a time
+
+        :param values: A `numpy.ndarray` of values
+        :return: A `numpy.ndarray` of strings, with an object dtype
+        """
+        formatted = np.empty(len(values), dtype=object)
+        formatted[:] = [self.format(value) for value in values]
+        return formatted
+
+    def to_array(self, values):
+        """
+        Converts a sequence of deserialized values (e.g. a column of a JSON
+        query response) into a column of this datum's dtype.  Columns holding
+        nulls are left as object arrays, with `None` marking missing values
+
+        :param values: A sequence of values
+        :return: A `numpy.ndarray`
+        """
+        if self.dtype == object or None in values:
+            return np.array(values, dtype=object)
+        return np.fromiter(values, dtype=self.dtype, count=len(values))
+
+    def to_column(self, values):
+        """
+        Coerces the values of a column, as passed to a measurement, into this
+        datum's dtype
+
+        :param values: A `numpy.ndarray` or other array-like
+        :return: A `numpy.ndarray`, or for integers with missing values, a
+            nullable `pandas.arrays.IntegerArray`
+        """
+        return np.asarray(values, dtype=object)
+
+    def empty_column(self, num_rows):
+        """
+        Allocates a column of missing values of this datum's dtype
+
+        :param num_rows: The length of the column
+        :return: An array, as per `to_column`
+        """
+        return np.full(num_rows, None, dtype=object)
+
+    def to_ndarray(self, values):
+        """
+        Same as `to_column`, but without pandas types, as stored by the NumPy
+        backend.  Columns holding missing values, other than floats, are left
+        as object arrays, with `None` marking missing values
+
+        :param values: A `numpy.ndarray`
+        :return: A `numpy.ndarray`
+        """
+        if values.dtype == self.dtype:
+            return values
+        if values.dtype.kind in "biu" and self.dtype.kind in "biuf":
+            return values.astype(self.dtype)
+        return self.to_array(values.tolist())
+
+    def parse_array(self, values):
+        """
+        Parses an array of raw line protocol values, i.e. the inverse of
+        `format_array`.  The default leaves the values as they are
+
+        :param values: A `numpy.ndarray` of strings
+        :return: A `numpy.ndarray`
+        """
+        return np.asarray(values, dtype=object)
+
+
+def _missing(values):
+    """
+    Flags the `None` and NaN entries of an array, like `pandas.isnull`
+    """
+    if values.dtype == object:
+        # NaN is the only value which isn't equal to itself
+        return (
+            np.equal(values, None).astype(bool) |
+            np.not_equal(values, values).astype(bool)
+        )
+    if values.dtype.kind == "f":
+        return np.isnan(values)
+    return np.zeros(len(values), dtype=bool)
+
+
+def _escape_array(values, characters):
+    escaped = np.asarray(values).astype(str)
+    if len(escaped):
+        for character in characters:
+            escaped = np.char.replace(escaped, character, "\\" + character)
+    return escaped.astype(object)
+
+
+def _unescape_array(values, pattern):
+    unescaped = np.array(values, dtype=object)
+    escaped = np.flatnonzero(np.char.find(unescaped.astype(str), "\\") >= 0)
+    unescaped[escaped] = [
+        pattern.sub(r"\1", value) for value in unescaped[escaped]
+    ]
+    return unescaped
+
+
+_tag_escape = re.compile(r"\\([ ,=])")
+_string_escape = re.compile(r"\\([\"\\])")
+
+_true_values = ("t", "T", "true", "True", "TRUE")
+_false_values = ("f", "F", "false", "False", "FALSE")
+
 
 class Tag(Datum):
     def format(self, value):
         return str(value).replace(" ", "\ ").replace(",", "\,").replace("=", "\=")
 
+    def format_array(self, values):
+        return _escape_array(values, " ,=")
+
+    def parse_array(self, values):
+        return _unescape_array(values, _tag_escape)
+
+    def to_column(self, values):
+        """
+        Tags are stored as categoricals, as they repeat across many rows: each
+        distinct value is held (and escaped when serialized) once, and each
+        row holds an integer code.  As tags are always strings within the
+        database, values are converted to strings, and NaNs, unlike `None`,
+        are not considered missing
+        """
+        if isinstance(values, pd.Categorical):
+            codes, uniques = values.codes, np.asarray(values.categories)
+        else:
+            values = np.asarray(values, dtype=object)
+            codes, uniques = pd.factorize(values)
+            nans = (codes == -1) & ~np.equal(values, None).astype(bool)
+            if nans.any():
+                codes[nans] = len(uniques)
+                uniques = np.append(uniques, "nan")
+
+        # Distinct values may share a string, e.g. 1 and "1"
+        remapped, categories = pd.factorize(uniques.astype(str).astype(object))
+        # Only present values are remapped, as there may be no uniques at all
+        codes = codes.astype(np.int64)
+        present = codes != -1
+        codes[present] = remapped[codes[present]]
+        return pd.Categorical.from_codes(codes, categories)
+
+    def empty_column(self, num_rows):
+        return pd.Categorical.from_codes(np.full(num_rows, -1), [])
+
+    def to_ndarray(self, values):
+        # Converted to strings as per `to_column`, but a row at a time
+        values = np.asarray(values, dtype=object)
+        nulls = np.equal(values, None).astype(bool)
+        strings = np.full(len(values), None, dtype=object)
+        strings[~nulls] = values[~nulls].astype(str)
+        return strings
+
 
 class Field(Datum):
     pass
 
 
 class FloatField(Field):
+    dtype = np.dtype(np.float64)
+
     def format(self, value):
         return str(float(value))
 
+    def format_array(self, values):
+        return np.asarray(values).astype(np.float64).astype(str).astype(object)
+
+    def parse_array(self, values):
+        return np.asarray(values).astype(np.float64)
+
+    def to_array(self, values):
+        try:
+            return np.fromiter(values, dtype=np.float64, count=len(values))
+        except TypeError:
+            # Missing values, i.e. `None`, become NaN
+            return np.array(values, dtype=np.float64)
+
+    def to_column(self, values):
+        # Missing values, i.e. `None`, become NaN
+        return np.asarray(values, dtype=np.float64)
+
+    def empty_column(self, num_rows):
+        return np.full(num_rows, np.nan)
+
 
 class IntegerField(Field):
+    dtype = np.dtype(np.int64)
+
     def format(self, value):
         return "{}i".format(int(value))
 
+    def format_array(self, values):
+        values = np.asarray(values)
+        if values.dtype.kind == "f" and not np.isfinite(values).all():
+            raise ValueError("Cannot convert non-finite values to integer")
+        return values.astype(np.int64).astype(str).astype(object) + "i"
+
+    def to_column(self, values):
+        if isinstance(values, pd.arrays.IntegerArray):
+            return values.astype("Int64")
+        integers, nulls = self._to_integers(values)
+        if not nulls.any():
+            return integers
+        return pd.arrays.IntegerArray(integers, nulls)
+
+    def to_ndarray(self, values):
+        integers, nulls = self._to_integers(values)
+        if not nulls.any():
+            return integers
+        column = integers.astype(object)
+        column[nulls] = None
+        return column
+
+    @staticmethod
+    def _to_integers(values):
+        """
+        Converts values into int64, shared by both backends
+
+        :return: An `(integers, nulls)` pair, missing values being 0 within
+            `integers`
+        """
+        values = np.asarray(values)
+        if values.dtype.kind in "biu":
+            nulls = np.zeros(len(values), dtype=bool)
+            return values.astype(np.int64, copy=False), nulls
+
+        nulls = _missing(values)
+        present = values[~nulls]
+        if present.dtype.kind in "fO" and not np.isfinite(present.astype(np.float64)).all():
+            raise ValueError("Cannot convert non-finite values to integer")
+        integers = np.zeros(len(values), dtype=np.int64)
+        integers[~nulls] = present.astype(np.int64)
+        return integers, nulls
+
+    def empty_column(self, num_rows):
+        return pd.arrays.IntegerArray(
+            np.zeros(num_rows, dtype=np.int64),
+            np.ones(num_rows, dtype=bool)
+        )
+
+    def parse_array(self, values):
+        values = np.asarray(values).astype(str)
+        if not np.char.endswith(values, "i").all():
+            raise ValueError("Integer values must be suffixed with \"i\"")
+        return np.char.rstrip(values, "i").astype(np.int64)
+
 
 class BooleanField(Field):
+    dtype = np.dtype(np.bool_)
+
     def format(self, value):
         return str(bool(value))
 
+    def format_array(self, values):
+        values = np.asarray(values)
+        if values.dtype.kind not in "biuf":
+            values = values.astype(object)
+        formatted = np.where(values.astype(bool), "True", "False")
+        return formatted.astype(object)
+
+    def to_column(self, values):
+        values = np.asarray(values)
+        if values.dtype.kind == "b":
+            return values
+        nulls = _missing(values)
+        present = values[~nulls]
+        if present.dtype.kind in "SU" or present.dtype == object and any(
+            isinstance(value, (str, bytes)) for value in present.tolist()
+        ):
+            raise ValueError("Cannot convert strings to booleans")
+        if not nulls.any():
+            return values.astype(bool)
+        # Booleans have no nullable dtype, so missing values are kept as None
+        column = np.full(len(values), None, dtype=object)
+        column[~nulls] = present.astype(bool)
+        return column
+
+    def to_ndarray(self, values):
+        # Both backends store booleans the same way
+        return self.to_column(values)
+
+    def parse_array(self, values):
+        values = np.asarray(values).astype(str)
+        true = np.isin(values, _true_values)
+        if not (true | np.isin(values, _false_values)).all():
+            raise ValueError("Unrecognized boolean value")
+        return true
+
 
 class StringField(Field):
     def format(self, value):
         return "\"{}\"".format(
             str(value).replace('"', '\\"')
         )
+
+    def format_array(self, values):
+        return "\"" + _escape_array(values, '"') + "\""
+
+    def parse_array(self, values):
+        values = np.asarray(values).astype(str)
+        if len(values) and not (
+            np.char.startswith(values, '"') & np.char.endswith(values, '"')
+        ).all():
+            raise ValueError("String values must be enclosed in double quotes")
+        return _unescape_array(
+            [value[1:-1] for value in values.tolist()],
+            _string_escape
+        )
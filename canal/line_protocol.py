@@ -0,0 +1,878 @@
+"""
+Column-at-a-time serialization into (and parsing from) the InfluxDB line
+protocol
+
+Each field column is formatted in a single vectorized pass, and the resulting
+columns are concatenated into lines.  Tags are only escaped and formatted once
+per series, i.e. unique combination of tag values.  Only rows which contain
+null entries are assembled one at a time, since the nulls have to be skipped.
+"""
+import collections
+import concurrent.futures
+import functools
+import itertools
+import re
+import zlib
+
+import numpy as np
+
+from . import util
+from .exceptions import MissingFieldError, MissingTagError
+
+pd = util.LazyModule("pandas")
+
+
+def null_mask(values):
+    """
+    Flags the missing entries of an array: `None` within object arrays, NaN
+    within float arrays, and the masked entries of nullable integer arrays.
+    NaNs within object arrays, e.g. tags, are not considered null, and are
+    serialized as they are
+
+    :param values: A `numpy.ndarray`, `pandas.arrays.IntegerArray` or
+        `pandas.Categorical`
+    :return: A boolean `numpy.ndarray`
+    """
+    if not isinstance(values, np.ndarray):
+        if isinstance(values, pd.Categorical):
+            return values.codes == -1
+        return np.asarray(values.isna())
+    if values.dtype == object:
+        return np.equal(values, None).astype(bool)
+    if values.dtype.kind == "f":
+        return np.isnan(values)
+    return np.zeros(len(values), dtype=bool)
+
+
+def escape_measurement(name):
+    """
+    Escapes a measurement name for use within the line protocol
+    """
+    return name.replace(",", "\\,").replace(" ", "\\ ")
+
+
+def escape_key(key):
+    """
+    Escapes a tag or field key for use within the line protocol
+    """
+    return key.replace(",", "\\,").replace("=", "\\=").replace(" ", "\\ ")
+
+
+def format_columns(columns, num_rows):
+    """
+    Formats columns into comma separated `key=value` pairs, one string per row
+
+    :param columns: A sequence of `(key, format_array, values)` triples, where
+        `key` is the escaped key followed by an equals sign
+    :param num_rows: The number of rows within each column
+    :return: A `numpy.ndarray` of strings, with an object dtype
+    """
+    segments = []
+    partial = np.zeros(num_rows, dtype=bool)
+    for key, format_array, values in columns:
+        nulls = null_mask(values)
+        if not isinstance(values, np.ndarray) and isinstance(values, pd.Categorical):
+            # Only the categories are formatted, once each, with a trailing
+            # placeholder selected by the missing entries' code of -1
+            categories = np.append(format_array(values.categories.values), "")
+            formatted = categories[values.codes]
+            partial |= nulls
+        elif nulls.any():
+            formatted = np.empty(num_rows, dtype=object)
+            formatted[~nulls] = format_array(values[~nulls])
+            partial |= nulls
+        else:
+            formatted = format_array(values)
+        segments.append((key, nulls, formatted))
+
+    lines = np.full(num_rows, "", dtype=object)
+    complete = ~partial
+    joined = None
+    for key, _, formatted in segments:
+        segment = key + formatted[complete]
+        joined = segment if joined is None else joined + "," + segment
+    if joined is not None:
+        lines[complete] = joined
+
+    # Rows containing nulls are the only ones which are joined individually
+    for row in np.flatnonzero(partial):
+        lines[row] = ",".join(
+            key + formatted[row]
+            for key, nulls, formatted in segments
+            if not nulls[row]
+        )
+    return lines
+
+
+#: The number of rows from which tags are formatted once per series
+GROUP_MIN_ROWS = 128
+
+
+def _first_appearance_codes(values):
+    """
+    Encodes an array of sortable values as integer codes, numbered in order
+    of first appearance (as per `pandas.factorize`) using NumPy alone
+
+    :return: A `(codes, num_codes)` pair
+    """
+    uniques, first, inverse = np.unique(
+        values,
+        return_index=True,
+        return_inverse=True
+    )
+    order = np.empty(len(uniques), dtype=np.int64)
+    order[np.argsort(first)] = np.arange(len(uniques))
+    return order[inverse], len(uniques)
+
+
+def factorize(values):
+    """
+    Encodes a column as integer codes, equal values sharing the same code
+
+    :param values: A `numpy.ndarray`, `pandas.arrays.IntegerArray` or
+        `pandas.Categorical`
+    :return: A `(codes, num_codes)` pair, where `None` entries are coded as -1
+    """
+    if not isinstance(values, np.ndarray):
+        if isinstance(values, pd.Categorical):
+            # Already encoded, though unused categories are harmless here
+            return values.codes.astype(np.int64), len(values.categories)
+        codes, uniques = pd.factorize(values)
+        return codes, len(uniques)
+
+    # Plain arrays are left to NumPy, so that pandas needn't be imported
+    nulls = null_mask(values)
+    present = values[~nulls]
+    if values.dtype == object:
+        # Values are compared as they are serialized, i.e. as strings, which
+        # also sorts mixed types, and codes NaNs alike
+        present = present.astype(str)
+    codes = np.full(len(values), -1, dtype=np.int64)
+    codes[~nulls], num_codes = _first_appearance_codes(present)
+    return codes, num_codes
+
+
+def group_rows(columns, num_rows):
+    """
+    Groups together the rows which hold identical values in every column
+
+    :param columns: A sequence of `numpy.ndarray` columns
+    :param num_rows: The number of rows within each column
+    :return: A `(groups, representatives)` pair, holding the group of each
+        row, and the index of one row from each group
+    """
+    groups = np.zeros(num_rows, dtype=np.int64)
+    num_groups = 1 if num_rows else 0
+    for values in columns:
+        codes, num_codes = factorize(values)
+        groups, num_groups = _first_appearance_codes(
+            groups * (num_codes + 1) + (codes + 1)
+        )
+
+    representatives = np.empty(num_groups, dtype=np.int64)
+    representatives[groups] = np.arange(num_rows)
+    return groups, representatives
+
+
+def format_timestamps(values, precision="ns"):
+    """
+    Formats a column of timestamps as integers since the epoch. An unset time
+    column results in empty timestamps, whereas NaTs, i.e. points left for the
+    server to timestamp, result in `None`
+
+    :param values: A `numpy.ndarray` of `datetime64[ns]`
+    :param precision: The precision of the timestamps, "ns", "u", "ms" or "s"
+    :return: A `numpy.ndarray` of strings, with an object dtype
+    """
+    scale = util.nanoseconds_per(precision)
+    if values.dtype.kind == "M":
+        timestamps = values.view(np.int64)
+        if scale != 1:
+            timestamps = timestamps // scale
+        formatted = timestamps.astype(str).astype(object)
+        formatted[np.isnat(values)] = None
+        return formatted
+    return np.full(len(values), "", dtype=object)
+
+
+class Serializer(object):
+    """
+    Serializes the columns of a single measurement class
+
+    Everything which only depends upon the schema of the class (the escaped
+    measurement name and keys, the formatter of each column and the required
+    columns) is resolved once, when the measurement class is created, rather
+    than on every call
+    """
+
+    def __init__(self, schema):
+        """
+        :param schema: The `Schema` of the measurement class
+        """
+        self.measurement_name = escape_measurement(schema.name)
+        self.tags = tuple(
+            (attname, "{}=".format(escape_key(tag.db_name)), tag.format_array)
+            for attname, tag in schema.tags.items()
+        )
+        self.fields = tuple(
+            (attname, "{}=".format(escape_key(field.db_name)), field.format_array)
+            for attname, field in schema.fields.items()
+        )
+        self.required = tuple(
+            (attname, MissingTagError, "Required tag \"{}\" not provided")
+            for attname, tag in schema.tags.items() if tag.required
+        ) + tuple(
+            (attname, MissingFieldError, "Required field \"{}\" not provided")
+            for attname, field in schema.fields.items() if field.required
+        )
+
+    def check_required(self, columns):
+        """
+        Raises a `MissingTagError` or `MissingFieldError` if any required
+        column contains nulls, or NaNs, or a `MissingFieldError` if any row
+        has no fields at all, as InfluxDB rejects points without fields
+        """
+        for attname, error, message in self.required:
+            values = columns[attname]
+            missing = null_mask(values)
+            if values.dtype == object:
+                # NaN is the only value which isn't equal to itself
+                missing |= np.not_equal(values, values).astype(bool)
+            if missing.any():
+                raise error(message.format(attname))
+
+        fieldless = np.ones(len(columns), dtype=bool)
+        for attname, _, _ in self.fields:
+            fieldless &= null_mask(columns[attname])
+        if fieldless.any():
+            raise MissingFieldError(
+                "No fields provided for row {}".format(np.flatnonzero(fieldless)[0])
+            )
+
+    def format_lines(self, columns, precision="ns"):
+        """
+        Serializes columns into lines of the InfluxDB line protocol
+
+        :param columns: The `Columns` of a measurement to serialize
+        :param precision: The precision of the timestamps
+        :return: A `numpy.ndarray` of lines, with an object dtype
+        """
+        num_rows = len(columns)
+        field_pairs = format_columns([
+            (key, format_array, columns[attname])
+            for attname, key, format_array in self.fields
+        ], num_rows)
+
+        # Series keys are only built once per unique combination of tags,
+        # unless there are too few rows for grouping to pay off
+        tag_columns = [columns[attname] for attname, _, _ in self.tags]
+        if num_rows >= GROUP_MIN_ROWS:
+            groups, representatives = group_rows(tag_columns, num_rows)
+        else:
+            groups = representatives = np.arange(num_rows)
+        tag_pairs = format_columns([
+            (key, format_array, values[representatives])
+            for (_, key, format_array), values in zip(self.tags, tag_columns)
+        ], len(representatives))
+
+        series_keys = np.full(
+            len(representatives),
+            self.measurement_name,
+            dtype=object
+        )
+        tagged = tag_pairs != ""
+        series_keys[tagged] = self.measurement_name + "," + tag_pairs[tagged]
+
+        lines = series_keys[groups] + " " + field_pairs
+        timestamps = format_timestamps(columns["time"], precision)
+        stamped = ~np.equal(timestamps, None).astype(bool)
+        lines[stamped] = lines[stamped] + " " + timestamps[stamped]
+        return lines
+
+
+#: The number of rows serialized at a time when streaming without a line limit
+CHUNK_SIZE = 5000
+
+
+def _batch_bounds(sizes, max_lines, max_bytes):
+    """
+    Splits lines into consecutive batches, bounded by both a number of lines
+    and a number of bytes.  A single line exceeding `max_bytes` is placed in a
+    batch of its own
+
+    :param sizes: The encoded size of each line, including its separator
+    :return: A list of `(start, stop)` index pairs
+    """
+    offsets = np.cumsum(sizes)
+    bounds = []
+    start = 0
+    while start < len(sizes):
+        stop = len(sizes)
+        if max_lines is not None:
+            stop = min(stop, start + max_lines)
+        if max_bytes is not None:
+            base = offsets[start - 1] if start else 0
+            fits = np.searchsorted(offsets, base + max_bytes + 1, side="right")
+            stop = max(start + 1, min(stop, fits))
+        bounds.append((start, stop))
+        start = stop
+    return bounds
+
+
+def format_block(serializer, columns, precision="ns"):
+    """
+    Serializes a block of rows into a single string.  This is the unit of work
+    handed to worker processes by `format_parallel`
+    """
+    return "\n".join(serializer.format_lines(columns, precision).tolist())
+
+
+def format_parallel(serializer, columns, workers, precision="ns"):
+    """
+    Serializes columns into the InfluxDB line protocol, splitting their rows
+    into blocks which are formatted in a pool of worker processes
+
+    :param serializer: The `Serializer` of the measurement class
+    :param columns: The `Columns` of a measurement to serialize
+    :param workers: The number of worker processes
+    :param precision: The precision of the timestamps
+    :return: A string
+    """
+    num_rows = len(columns)
+    # A few blocks per worker keep the pool busy if some finish early
+    num_blocks = min(num_rows, 4 * workers)
+    bounds = np.linspace(0, num_rows, num_blocks + 1).astype(np.int64)
+    blocks = [
+        columns.take(slice(start, stop))
+        for start, stop in zip(bounds[:-1], bounds[1:])
+    ]
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        return "\n".join(executor.map(
+            format_block,
+            itertools.repeat(serializer),
+            blocks,
+            itertools.repeat(precision)
+        ))
+
+
+def _map_ordered(executor, function, items, lookahead):
+    """
+    Like `executor.map`, but only keeps `lookahead` items in flight at once
+    """
+    futures = collections.deque()
+    for item in items:
+        futures.append(executor.submit(function, item))
+        if len(futures) >= lookahead:
+            yield futures.popleft().result()
+    while futures:
+        yield futures.popleft().result()
+
+
+def iter_windows(serializer, columns, window, workers=None,
+                 precision="ns"):
+    """
+    Serializes columns a window of rows at a time
+
+    :param serializer: The `Serializer` of the measurement class
+    :param columns: The `Columns` of a measurement to serialize
+    :param window: The number of rows per window
+    :param workers: The number of worker processes formatting windows ahead
+        of the consumer, or `None` to format them in this process
+    :param precision: The precision of the timestamps
+    :return: A generator of `numpy.ndarray` windows of lines
+    """
+    format_lines = functools.partial(
+        serializer.format_lines,
+        precision=precision
+    )
+    blocks = (
+        columns.take(slice(start, start + window))
+        for start in range(0, len(columns), window)
+    )
+    if workers is None:
+        for block in blocks:
+            yield format_lines(block)
+    else:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            yield from _map_ordered(
+                executor,
+                format_lines,
+                blocks,
+                2 * workers
+            )
+
+
+def regroup(windows, max_lines=None, max_bytes=None):
+    """
+    Regroups windows of lines into batches, bounded by both a number of lines
+    and an encoded size.  Lines are never reordered, but batches may span
+    several windows
+
+    :param windows: An iterable of `numpy.ndarray` windows of lines
+    :param max_lines: The maximum number of lines per batch
+    :param max_bytes: The maximum UTF-8 encoded size of a batch, once its
+        lines are joined by newlines
+    :return: A generator of `numpy.ndarray` batches of lines
+    """
+    if max_lines is not None and max_lines < 1:
+        raise ValueError("max_lines must be a positive integer")
+    if max_bytes is not None and max_bytes < 1:
+        raise ValueError("max_bytes must be a positive integer")
+    return _regroup(windows, max_lines, max_bytes)
+
+
+def _regroup(windows, max_lines, max_bytes):
+    pending = np.empty(0, dtype=object)
+    pending_sizes = np.empty(0, dtype=np.int64)
+    for lines in windows:
+        sizes = np.fromiter(
+            map(len, map(str.encode, lines)),
+            dtype=np.int64,
+            count=len(lines)
+        ) + 1
+        lines = np.concatenate([pending, lines])
+        sizes = np.concatenate([pending_sizes, sizes])
+
+        # The trailing batch may still be topped up by the next window
+        bounds = _batch_bounds(sizes, max_lines, max_bytes)
+        for start, stop in bounds[:-1]:
+            yield lines[start:stop]
+        start, stop = bounds[-1]
+        pending, pending_sizes = lines[start:stop], sizes[start:stop]
+
+    if len(pending):
+        yield pending
+
+
+def iter_batches(serializer, columns, max_lines=None, max_bytes=None,
+                 workers=None, precision="ns"):
+    """
+    Serializes rows a window at a time, and regroups the resulting lines into
+    batches.  Only a few windows of lines are held in memory at once
+
+    :param serializer: The `Serializer` of the measurement class
+    :param columns: The `Columns` of a measurement to serialize
+    :param max_lines: The maximum number of lines per batch
+    :param max_bytes: The maximum UTF-8 encoded size of a batch, once its
+        lines are joined by newlines
+    :param workers: The number of worker processes formatting windows ahead
+        of the consumer, or `None` to format them in this process
+    :param precision: The precision of the timestamps
+    :return: A generator of `numpy.ndarray` batches of lines
+    """
+    if workers is not None and workers < 1:
+        raise ValueError("workers must be a positive integer")
+    util.nanoseconds_per(precision)
+    windows = iter_windows(
+        serializer,
+        columns,
+        max_lines or CHUNK_SIZE,
+        workers,
+        precision
+    )
+    return regroup(windows, max_lines, max_bytes)
+
+
+def binary_writer(fp):
+    """
+    Returns a callable which writes bytes into a binary destination
+
+    :param fp: A binary file object (including `io.BytesIO`), a socket or a
+        `bytearray`
+    :return: A callable taking a bytes-like object
+    """
+    if isinstance(fp, bytearray):
+        return fp.extend
+    if hasattr(fp, "sendall"):
+        return fp.sendall
+    return fp.write
+
+
+class GzipWriter(object):
+    """
+    A binary writer which gzip compresses everything written into it, as it
+    is written, into a destination accepted by `binary_writer`.  Closing the
+    writer completes the gzip member
+    """
+
+    def __init__(self, fp, compresslevel=6):
+        self._write = binary_writer(fp)
+        self._compressor = zlib.compressobj(
+            compresslevel,
+            zlib.DEFLATED,
+            16 + zlib.MAX_WBITS
+        )
+
+    def write(self, data):
+        compressed = self._compressor.compress(data)
+        if compressed:
+            self._write(compressed)
+        return len(data)
+
+    def close(self):
+        self._write(self._compressor.flush())
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+# Parsing
+
+#: The number of characters or bytes read from file objects at a time
+READ_SIZE = 1 << 20
+
+_key = r"(?:[^,=\s\\]|\\.)+"
+_tag_value = r"(?:[^,=\s\\]|\\.)*"
+_field_value = r"(?:\"(?:[^\"\\]|\\.)*\"|[^,\s\"]+)"
+_line_pattern = re.compile(
+    r"(?P<measurement>(?:[^,\s\\]|\\.)+)"
+    r"(?P<tags>(?:,{key}={tag_value})*)"
+    r" (?P<fields>(?:{key}={field_value}(?:,{key}={field_value})*)?)"
+    r"(?: (?P<timestamp>-?\d*))?$".format(
+        key=_key,
+        tag_value=_tag_value,
+        field_value=_field_value
+    )
+)
+_tag_pattern = re.compile(r",({key})=({tag_value})".format(
+    key=_key,
+    tag_value=_tag_value
+))
+_field_pattern = re.compile(r"({key})=({field_value})".format(
+    key=_key,
+    field_value=_field_value
+))
+_measurement_escape = re.compile(r"\\([ ,])")
+_key_escape = re.compile(r"\\([ ,=])")
+
+
+def _unescape_key(key):
+    return _key_escape.sub(r"\1", key) if "\\" in key else key
+
+
+def split_line(line):
+    """
+    Splits a line of the InfluxDB line protocol into its components.  Keys and
+    the measurement name are unescaped, values are left as they are
+
+    :param line: A line of line protocol, without its trailing newline
+    :return: A `(measurement, tags, fields, timestamp)` tuple, where `tags`
+        and `fields` are lists of `(key, value)` pairs, and the timestamp is
+        a string (or `None`)
+    """
+    if "\\" not in line and "\"" not in line:
+        # Nothing is escaped or quoted, so plain splits will do
+        parts = line.split(" ")
+        if len(parts) == 2:
+            head, field_set = parts
+            timestamp = None
+        elif len(parts) == 3:
+            head, field_set, timestamp = parts
+        else:
+            raise ValueError("Could not parse line: {!r}".format(line))
+        head = head.split(",")
+        tags = [tuple(pair.split("=", 1)) for pair in head[1:]]
+        fields = [
+            tuple(pair.split("=", 1)) for pair in field_set.split(",")
+        ] if field_set else []
+        if any(len(pair) != 2 for pair in itertools.chain(tags, fields)):
+            raise ValueError("Could not parse line: {!r}".format(line))
+        return head[0], tags, fields, timestamp or None
+
+    match = _line_pattern.match(line)
+    if not match:
+        raise ValueError("Could not parse line: {!r}".format(line))
+    measurement = _measurement_escape.sub(r"\1", match.group("measurement"))
+    tags = [
+        (_unescape_key(key), value)
+        for key, value in _tag_pattern.findall(match.group("tags"))
+    ]
+    fields = [
+        (_unescape_key(key), value)
+        for key, value in _field_pattern.findall(match.group("fields"))
+    ]
+    return measurement, tags, fields, match.group("timestamp") or None
+
+
+def split_uniform(lines):
+    """
+    Splits lines which all share the same layout (measurement, keys and key
+    order, presence of a timestamp) and contain no escaped or quoted content
+    into columns, with a handful of splits over the whole block rather than
+    per line.  This is the common case of line protocol written in bulk
+
+    :param lines: A list of lines
+    :return: A `(measurement, tags, fields, timestamps)` tuple, as returned by
+        `split_line` but with columns of values in place of single values, or
+        `None` if the lines do not share a layout
+    """
+    if not lines:
+        return None
+    text = "\n".join(lines)
+    if "\\" in text or "\"" in text:
+        return None
+    try:
+        measurement, tags, fields, timestamp = split_line(lines[0])
+    except ValueError:
+        return None
+
+    num_lines = len(lines)
+    parts = text.replace("\n", " ").split(" ")
+    width = lines[0].count(" ") + 1
+    if len(parts) != num_lines * width:
+        return None
+
+    def split_pairs(sections, pairs, leading):
+        tokens = ",".join(sections).replace("=", ",").split(",")
+        if len(tokens) != num_lines * (leading + 2 * len(pairs)):
+            return None
+        tokens = np.array(tokens, dtype=object).reshape(num_lines, -1)
+        for index, (key, _) in enumerate(pairs):
+            if not (tokens[:, leading + 2 * index] == key).all():
+                return None
+        return tokens
+
+    heads = split_pairs(parts[0::width], tags, 1)
+    if heads is None or not (heads[:, 0] == measurement).all():
+        return None
+    if fields:
+        field_sets = split_pairs(parts[1::width], fields, 0)
+        if field_sets is None:
+            return None
+    elif any(parts[1::width]):
+        return None
+
+    timestamps = np.full(num_lines, None, dtype=object)
+    if width == 3:
+        timestamps[:] = parts[2::width]
+        timestamps[timestamps == ""] = None
+    return (
+        measurement,
+        [(key, heads[:, 2 + 2 * index]) for index, (key, _) in enumerate(tags)],
+        [
+            (key, field_sets[:, 1 + 2 * index])
+            for index, (key, _) in enumerate(fields)
+        ],
+        timestamps
+    )
+
+
+def iter_chunks(source):
+    """
+    Reads content which may arrive in chunks.  File objects which support
+    `read1`, such as HTTP responses, yield data as soon as it arrives rather
+    than once `READ_SIZE` bytes have accumulated
+
+    :param source: A string, a bytes-like object, a (text or binary) file
+        object, or an iterable of string or bytes chunks
+    :return: A generator of string or bytes chunks
+    """
+    if isinstance(source, (str, bytes)):
+        yield source
+    elif isinstance(source, (bytearray, memoryview)):
+        yield bytes(source)
+    elif hasattr(source, "read"):
+        read = getattr(source, "read1", source.read)
+        chunk = read(READ_SIZE)
+        while chunk:
+            yield chunk
+            chunk = read(READ_SIZE)
+    else:
+        for chunk in source:
+            yield bytes(chunk) if isinstance(chunk, (bytearray, memoryview)) else chunk
+
+
+def iter_lines(source, max_lines):
+    """
+    Reads lines from line protocol which may arrive in chunks, splitting
+    lines which straddle two chunks correctly
+
+    :param source: A string, a bytes-like object, a (text or binary) file
+        object, or an iterable of string or bytes chunks
+    :param max_lines: The maximum number of lines per list
+    :return: A generator of lists of lines
+    """
+    remainder = None
+    pending = []
+    for chunk in iter_chunks(source):
+        data = chunk if remainder is None else remainder + chunk
+        newline = b"\n" if isinstance(data, bytes) else "\n"
+        end = data.rfind(newline)
+        if end < 0:
+            remainder = data
+            continue
+        complete, remainder = data[:end], data[end + 1:]
+        if isinstance(complete, bytes):
+            complete = complete.decode()
+        pending.extend(complete.split("\n"))
+        while len(pending) >= max_lines:
+            yield pending[:max_lines]
+            pending = pending[max_lines:]
+
+    if remainder:
+        pending.append(
+            remainder.decode() if isinstance(remainder, bytes) else remainder
+        )
+    if pending:
+        yield pending
+
+
+def parse_timestamps(timestamps, precision="ns"):
+    """
+    Parses integer timestamps into `datetime64[ns]`
+
+    :param timestamps: A sequence of strings, where `None` marks a missing
+        timestamp
+    :param precision: The precision of the timestamps
+    :return: A `numpy.ndarray` of `datetime64[ns]`, or `None` if every
+        timestamp is missing
+    """
+    timestamps = np.array(timestamps, dtype=object)
+    missing = null_mask(timestamps)
+    if missing.all():
+        return None
+
+    nanoseconds = np.zeros(len(timestamps), dtype=np.int64)
+    nanoseconds[~missing] = timestamps[~missing].astype(np.int64)
+    nanoseconds *= util.nanoseconds_per(precision)
+    time = nanoseconds.view("datetime64[ns]")
+    time[missing] = np.datetime64("NaT")
+    return time
+
+
+class Parser(object):
+    """
+    Parses line protocol into the columns of a single measurement class.  Like
+    `Serializer`, it is built once, when the measurement class is created
+    """
+
+    def __init__(self, schema):
+        """
+        :param schema: The `Schema` of the measurement class
+        """
+        self.measurement_name = schema.name
+        self.tags = {
+            db_name: (attname, tag.parse_array)
+            for db_name, (attname, tag) in schema.tags_by_db_name.items()
+        }
+        self.fields = {
+            db_name: (attname, field.parse_array)
+            for db_name, (attname, field) in schema.fields_by_db_name.items()
+        }
+
+    def _resolve(self, key, kind):
+        schema = self.tags if kind == "tag" else self.fields
+        try:
+            return schema[key]
+        except KeyError:
+            raise ValueError("Unrecognized {} name {}".format(kind, key))
+
+    def _split_lines(self, lines):
+        timestamps = []
+        raw_columns = {}
+        for line in lines:
+            if not line or line.startswith("#"):
+                continue
+            measurement, tags, fields, timestamp = split_line(line)
+            if measurement != self.measurement_name:
+                continue
+
+            row = len(timestamps)
+            for kind, pairs in (("tag", tags), ("field", fields)):
+                for key, value in pairs:
+                    attname, parse_array = self._resolve(key, kind)
+                    rows, values, _ = raw_columns.setdefault(
+                        attname,
+                        ([], [], parse_array)
+                    )
+                    if rows and rows[-1] == row:
+                        # A key repeated within a line overrides the former
+                        values[-1] = value
+                    else:
+                        rows.append(row)
+                        values.append(value)
+            timestamps.append(timestamp)
+        return timestamps, raw_columns
+
+    def parse_lines(self, lines, precision="ns"):
+        """
+        Parses lines of the InfluxDB line protocol.  Empty lines, comments and
+        lines belonging to other measurements are skipped
+
+        :param lines: A list of lines
+        :param precision: The precision of the timestamps
+        :return: A `(num_rows, time, columns)` tuple, where `columns` maps
+            column names to `numpy.ndarray` columns.  Columns missing from
+            some of the lines hold `None` in those rows
+        """
+        uniform = split_uniform(lines)
+        if uniform is None:
+            timestamps, raw_columns = self._split_lines(lines)
+        elif uniform[0] != self.measurement_name:
+            timestamps, raw_columns = [], {}
+        else:
+            _, tags, fields, timestamps = uniform
+            raw_columns = {}
+            for kind, pairs in (("tag", tags), ("field", fields)):
+                for key, values in pairs:
+                    attname, parse_array = self._resolve(key, kind)
+                    raw_columns[attname] = (None, values, parse_array)
+
+        num_rows = len(timestamps)
+        columns = {}
+        for attname, (rows, values, parse_array) in raw_columns.items():
+            parsed = parse_array(np.asarray(values, dtype=object))
+            if rows is None or len(rows) == num_rows:
+                columns[attname] = parsed
+            else:
+                columns[attname] = np.full(num_rows, None, dtype=object)
+                columns[attname][rows] = parsed
+        return num_rows, parse_timestamps(timestamps, precision), columns
+
+    def iter_blocks(self, source, max_lines=CHUNK_SIZE, precision="ns"):
+        """
+        Parses line protocol a block of lines at a time
+
+        :param source: Anything accepted by `iter_lines`
+        :param max_lines: The maximum number of lines parsed at a time
+        :param precision: The precision of the timestamps
+        :return: A generator of blocks, as returned by `parse_lines`
+        """
+        util.nanoseconds_per(precision)
+        for lines in iter_lines(source, max_lines):
+            block = self.parse_lines(lines, precision)
+            if block[0]:
+                yield block
+
+
+def concatenate_blocks(blocks):
+    """
+    Concatenates parsed blocks of rows, as returned by `Parser.parse_lines`
+
+    :param blocks: A sequence of blocks
+    :return: A single block
+    """
+    num_rows = sum(block[0] for block in blocks)
+    if any(time is not None for _, time, _ in blocks):
+        time = np.concatenate([
+            np.full(rows, np.datetime64("NaT"), dtype="datetime64[ns]")
+            if time is None else time
+            for rows, time, _ in blocks
+        ])
+    else:
+        time = None
+
+    attnames = set(itertools.chain.from_iterable(
+        columns.keys() for _, _, columns in blocks
+    ))
+    columns = {
+        attname: np.concatenate([
+            columns.get(attname, np.full(rows, None, dtype=object))
+            for rows, _, columns in blocks
+        ])
+        for attname in attnames
+    }
+    return num_rows, time, columns
@@ -1,84 +1,59 @@
 import collections
 import datetime
+import gzip
+import io
 import itertools
 
 import numpy as np
-import pandas as pd
-import pytz
 
+from . import backends, line_protocol, responses, util
 from .datum import Tag, Field
-from .exceptions import MissingFieldError, MissingTagError
+from .schema import Schema
 
-
-def is_tag(args):
-    return isinstance(args[1], Tag)
-
-
-def is_field(args):
-    return isinstance(args[1], Field)
+pytz = util.LazyModule("pytz")
 
 
 class MeasurementMeta(type):
     def __new__(mcs, name, bases, attrs):
+        # Inherit the tags and fields of any base measurement classes, which
+        # those declared by this class override
         tags = {}
-        for key, tag in filter(is_tag, attrs.items()):
-            if tag.db_name is None:
-                tag.db_name = key
-            tags[key] = tag
-
         fields = {}
-        for key, field in filter(is_field, attrs.items()):
-            if field.db_name is None:
-                field.db_name = key
-            fields[key] = field
-
-        for key in itertools.chain(tags.keys(), fields.keys()):
+        for base in reversed(bases):
+            base_schema = getattr(base, "_schema", None)
+            if isinstance(base_schema, Schema):
+                tags.update(base_schema.tags)
+                fields.update(base_schema.fields)
+
+        for key, datum in list(attrs.items()):
+            if not isinstance(datum, (Tag, Field)):
+                continue
+            if datum.db_name is None:
+                datum.db_name = key
+            tags.pop(key, None)
+            fields.pop(key, None)
+            (tags if isinstance(datum, Tag) else fields)[key] = datum
             del attrs[key]
 
-        # Make the fields and tags aware of their attribute names (these will be
-        # utilized as field and tag names within the database)
-        # for attname, datum in {**tags, **fields}.items():
-        #     datum.name = attname
+        schema = Schema(name, tags, fields)
+        if attrs.get("BACKEND") is not None:
+            backends.get_backend(attrs["BACKEND"])
+
+        # Bind tags and fields as properties on instances.  These are placed
+        # in the class namespace directly, as assigning them afterwards would
+        # collide with the metaclass' own properties, e.g. `schema`
+        for attname in schema.tags_and_fields:
+            attrs[attname] = property(
+                mcs.getter_factory(attname),
+                mcs.setter_factory(attname)
+            )
 
         new_class = type.__new__(mcs, name, bases, attrs)
-
-        # Build a mapping of field and tag attribute names
-        new_class._register_tags(tags)
-        new_class._register_fields(fields)
-
-        # Bind tags and fields as properties on instances
-        for attname in new_class.tags_and_fields:
-            setattr(new_class, attname, property(
-                new_class.getter_factory(attname),
-                new_class.setter_factory(attname)
-            ))
-
+        new_class._schema = schema
+        new_class._serializer = line_protocol.Serializer(schema)
+        new_class._parser = line_protocol.Parser(schema)
         return new_class
 
-    def _register_tags(cls, tags):
-        try:
-            base_tags = cls.tags_by_attname
-        except AttributeError:
-            base_tags = {}
-
-        cls.tags_by_attname = collections.OrderedDict([
-            (key, base_tags.get(key, tags.get(key)))
-            for key in sorted(itertools.chain(base_tags.keys(), tags.keys()))
-        ])
-
-    def _register_fields(cls, fields):
-        try:
-            base_fields = cls.fields_by_attname
-        except AttributeError:
-            base_fields = {}
-
-        cls.fields_by_attname = collections.OrderedDict([
-            (key, base_fields.get(key, fields.get(key)))
-            for key in sorted(
-                itertools.chain(base_fields.keys(), fields.keys())
-            )
-        ])
-
     @staticmethod
     def getter_factory(name):
         def getter(instance):
@@ -91,24 +66,25 @@ class MeasurementMeta(type):
             instance._set_column(name, value)
         return setter
 
+    @property
+    def schema(cls):
+        """
+        The frozen `Schema` of this measurement class.  As this is a property
+        of the metaclass, it never clashes with a tag or field named "schema"
+        """
+        return cls._schema
+
+    @property
+    def tags_by_attname(cls):
+        return cls.schema.tags
+
+    @property
+    def fields_by_attname(cls):
+        return cls.schema.fields
+
     @property
     def tags_and_fields(cls):
-        if not hasattr(cls, "__tags_and_fields"):
-            cls.__tags_and_fields = collections.OrderedDict([
-                (
-                    key,
-                    cls.fields_by_attname.get(
-                        key, cls.tags_by_attname.get(key)
-                    )
-                )
-                for key in sorted(
-                    itertools.chain(
-                        cls.fields_by_attname.keys(),
-                        cls.tags_by_attname.keys()
-                    )
-                )
-            ])
-        return cls.__tags_and_fields
+        return cls.schema.tags_and_fields
 
 
 class Measurement(metaclass=MeasurementMeta):
@@ -121,61 +97,249 @@ class Measurement(metaclass=MeasurementMeta):
     """
 
     @classmethod
-    def from_json(cls, content):
+    def from_json(cls, content, epoch=None):
         """
         Deserializes a JSON response from an influxDB client, into an
-        instance of this class
+        instance of this class.  Every series of this measurement within the
+        response is included, e.g. each tag set of a `GROUP BY` query, with
+        the grouped tags' values filling their columns.  Raw responses are
+        decoded with the fastest installed JSON decoder
+
+        :param content: A JSON response, either already decoded (a `dict`),
+            or as a `str`, a bytes-like object or a (text or binary) file
+            object
+        :param epoch: The precision of integer timestamps, if the query was
+            made with an `epoch` parameter ("ns", "u", "ms" or "s"), or `None`
+            for RFC3339 timestamps
+        :return: An instance of this class
+        """
+        decoded = responses.decode_merged(
+            responses.read_json(content),
+            cls.schema,
+            epoch
+        )
+        if decoded is None:
+            raise ValueError("Invalid JSON")
+        time, columns = decoded
+        return cls(time=time, **columns)
+
+    @classmethod
+    def from_json_many(cls, content, epoch=None, workers=None,
+                       processes=False):
+        """
+        Deserializes every series of this measurement within a JSON response,
+        e.g. a response to several `;` separated statements or to a
+        `GROUP BY` query, into an instance of this class per statement and
+        tag set
+
+        :param content: Anything accepted by `from_json`
+        :param epoch: The precision of integer timestamps, as for `from_json`
+        :param workers: The number of worker threads or processes to decode
+            the series with, or `None` to decode them within the calling
+            thread
+        :param processes: Whether to decode with worker processes rather than
+            threads
+        :return: An `OrderedDict` mapping `(statement_id, tags)` pairs, where
+            `tags` is a sorted tuple of `(tag, value)` pairs, `value` being
+            `None` for an empty tag, to instances of this class, in the order
+            they appear within the response
+        """
+        if epoch is not None:
+            util.nanoseconds_per(epoch)
+        groups = responses.group_series(
+            responses.read_json(content),
+            cls.schema
+        )
+        decoded = responses.decode_groups(
+            list(groups.values()),
+            cls.schema,
+            epoch,
+            workers=workers,
+            processes=processes
+        )
+        return collections.OrderedDict(
+            (key, cls(time=time, **columns))
+            for key, (time, columns) in zip(groups, decoded)
+        )
 
-        :param content: JSON string received from an influxdb client
+    @classmethod
+    def from_msgpack(cls, content, epoch=None):
+        """
+        Deserializes a MessagePack response from InfluxDB, i.e. the response
+        to a query made with `Accept: application/x-msgpack`, into an
+        instance of this class.  This requires the optional msgpack package
+
+        :param content: A bytes-like object, a binary file object, or an
+            iterable of bytes chunks
+        :param epoch: The precision of integer timestamps, if the query was
+            made with an `epoch` parameter, or `None`
         :return: An instance of this class
         """
-        series = []
-        if "results" in content:
-            for s in [result["series"] for result in content["results"] if "series" in result]:
-                series.extend(s)
-        elif "series" in content:
-            series = [s for s in content["series"]]
-        elif "name" in content:
-            series = [content]
-
-        for s in series:
-            if s.get("name", None) == cls.__name__:
-                column_names = ["time"]
-                for column_name in s["columns"]:
-                    if column_name == "time":
-                        continue
-                    for name, datum in cls.tags_and_fields.items():
-                        if datum.db_name == column_name:
-                            column_names.append(name)
-                            break
-                    else:
-                        raise ValueError("Unrecognized column name {}".format(column_name))
-
-                df = pd.DataFrame.from_records(
-                    s["values"],
-                    columns=column_names
-                )
+        # Timestamps are decoded to integer nanoseconds unless the query
+        # asked for another precision
+        epoch = "ns" if epoch is None else epoch
+        util.nanoseconds_per(epoch)
+        results = [
+            result
+            for document in responses.iter_msgpack_documents(content)
+            for result in document.get("results", [])
+        ]
+        decoded = responses.decode_merged(
+            dict(results=results),
+            cls.schema,
+            epoch
+        )
+        if decoded is None:
+            raise ValueError("Invalid MessagePack")
+        time, columns = decoded
+        return cls(time=time, **columns)
+
+    @classmethod
+    def iter_from_json_stream(cls, content, epoch=None):
+        """
+        Deserializes a streamed JSON response, i.e. a response to a query
+        made with `chunked=true`, into instances of this class.  Each chunk
+        is decoded as it arrives, and an instance is yielded for every
+        matching series within it, so large exports can be processed with
+        bounded memory usage
+
+        :param content: A string, a bytes-like object, a (text or binary)
+            file object such as an HTTP response, or an iterable of string or
+            bytes chunks
+        :param epoch: The precision of integer timestamps, as for `from_json`
+        :return: A generator of instances of this class
+        """
+        if epoch is not None:
+            util.nanoseconds_per(epoch)
+        return (
+            cls(time=time, **columns)
+            for document in responses.iter_documents(content)
+            for time, columns in responses.iter_decoded(
+                document, cls.schema, epoch)
+        )
 
-                return cls(**{
-                    column: df[column] for column in column_names
-                })
+    @classmethod
+    def from_csv(cls, content, epoch="ns"):
+        """
+        Deserializes a CSV response from InfluxDB, i.e. the response to a
+        query made with `Accept: application/csv`, into an instance of this
+        class.  Rows of other measurements are skipped, and the tags of
+        grouped series fill their columns.  As CSV has no null marker, empty
+        values are treated as missing
+
+        :param content: A string, a bytes-like object, a (text or binary)
+            file object, or an iterable of string or bytes chunks
+        :param epoch: The precision of the integer timestamps, i.e. the
+            query's `epoch` parameter if it had one
+        :return: An instance of this class
+        """
+        time, columns = responses.decode_csv(
+            content,
+            cls.schema,
+            epoch
+        )
+        return cls(time=time, **columns)
 
-        raise ValueError("Invalid JSON")
+    @classmethod
+    def from_line_protocol(cls, content, precision="ns"):
+        """
+        Deserializes InfluxDB line protocol into an instance of this class.
+        Lines belonging to other measurements are skipped.  The content is
+        read and parsed a block of lines at a time, so it never needs to fit
+        in memory as a whole
+
+        :param content: A string, a bytes-like object, a (text or binary)
+            file object, or an iterable of string or bytes chunks
+        :param precision: The precision of the timestamps
+        :return: An instance of this class
+        """
+        util.nanoseconds_per(precision)
+        num_rows, time, columns = line_protocol.concatenate_blocks(list(
+            cls._parser.iter_blocks(content, precision=precision)
+        ))
+        if not num_rows:
+            time = np.empty(0, dtype="datetime64[ns]")
+        return cls(time=time, **columns)
+
+    @classmethod
+    def iter_from_line_protocol(cls, content, max_lines=5000, precision="ns"):
+        """
+        Deserializes InfluxDB line protocol into instances of this class, each
+        holding up to `max_lines` points, for processing large archives with
+        bounded memory usage
+
+        :param content: Anything accepted by `from_line_protocol`
+        :param max_lines: The maximum number of lines per instance
+        :param precision: The precision of the timestamps
+        :return: A generator of instances of this class
+        """
+        if max_lines < 1:
+            raise ValueError("max_lines must be a positive integer")
+        util.nanoseconds_per(precision)
+        blocks = cls._parser.iter_blocks(
+            content,
+            max_lines=max_lines,
+            precision=precision
+        )
+        return (cls(time=time, **columns) for _, time, columns in blocks)
+
+    @classmethod
+    def from_columns(cls, columns):
+        """
+        Creates an instance of this class from a mapping of column names, i.e.
+        the attribute names of tags and fields, and "time", to arrays.  Arrays
+        which already hold their column's dtype are used as they are rather
+        than copied, as are integer nanosecond timestamps, which are viewed as
+        `datetime64[ns]`.  The NumPy backend then stores them as they are,
+        whereas the pandas backend consolidates columns into its own blocks
+
+        :param columns: A mapping of column names to arrays, e.g. as returned
+            by `to_columns`
+        :return: An instance of this class
+        """
+        for name in columns:
+            if name not in cls.schema.columns:
+                raise ValueError("Unrecognized column name {}".format(name))
+        return cls(**columns)
+
+    @classmethod
+    def from_records(cls, records):
+        """
+        Creates an instance of this class from a NumPy structured array, e.g.
+        a record array, or a `numpy.memmap` of a file of records.  Each field
+        is named after a column, and is passed to `from_columns` as a view
+        into the records, so no data is copied where dtypes line up
+
+        :param records: A structured `numpy.ndarray`
+        :return: An instance of this class
+        """
+        names = getattr(getattr(records, "dtype", None), "names", None)
+        if names is None:
+            raise ValueError("Expected a structured array")
+        return cls.from_columns(collections.OrderedDict(
+            (name, records[name]) for name in names
+        ))
+
+    #: The name of the backend storing the columns of instances, one of
+    #: `canal.backends.BACKENDS`, or `None` for the default backend
+    BACKEND = None
 
     def __init__(self, time=None, **kwargs):
-        items = [
-            (name, kwargs.get(name, None))
-            for name in self.tags
-        ] + [
-            (name, kwargs.get(name, None))
-            for name in self.fields
-        ] + [
-            ('time', np.array(time, dtype='datetime64[ns]') if time is not None else None)
-        ]
-        self._data_frame = pd.DataFrame.from_items(items)
+        schema = type(self)._schema
+        backend = backends.get_backend(type(self).BACKEND)
+        num_rows = _num_rows([time] + list(kwargs.values()))
+        columns = collections.OrderedDict(
+            (attname, _column(backend, datum, kwargs.get(attname), num_rows))
+            for attname, datum in itertools.chain(
+                schema.tags.items(),
+                schema.fields.items()
+            )
+        )
+        columns["time"] = _time_column(time, num_rows)
+        self._columns = backend.from_columns(columns)
 
     def __len__(self):
-        return len(self.data_frame)
+        return len(self._columns)
 
     @property
     def tags(self):
@@ -188,15 +352,31 @@ class Measurement(metaclass=MeasurementMeta):
     @property
     def data_frame(self):
         """
-        Returns the underlying pandas dataframe wrapped by this instance
+        Returns the columns of this instance as a pandas dataframe.  With the
+        pandas backend, this is the underlying dataframe itself, otherwise it
+        is converted on demand
 
         :return: A `pandas.DataFrame` instance
         """
-        return self._data_frame
+        return self._columns.to_data_frame()
 
     @property
     def rec_array(self):
-        return self._data_frame.to_records(index=False)
+        return self._columns.to_records()
+
+    def to_columns(self):
+        """
+        Returns the columns of this instance as they are stored, without
+        copying them: tags are categoricals and integers with missing values
+        are `pandas.arrays.IntegerArray` with the pandas backend.  Changes to
+        the arrays are reflected by this instance
+
+        :return: An ordered mapping of column names to arrays
+        """
+        return collections.OrderedDict(
+            (name, self._columns[name])
+            for name in type(self)._schema.columns
+        )
 
     @property
     def time(self):
@@ -204,83 +384,142 @@ class Measurement(metaclass=MeasurementMeta):
 
     @time.setter
     def time(self, time):
-        if time is not None:
-            self._set_column("time", np.array(time, dtype='datetime64[ns]'))
-        else:
-            self._set_column("time", None)
+        self._set_column("time", _time_column(time, len(self)))
 
     def _get_column(self, name):
-        return self.data_frame[name].values
+        return self._columns.values(name)
 
     def _set_column(self, name, value):
-        self.data_frame[name] = value
+        datum = type(self)._schema.tags_and_fields.get(name)
+        if datum is not None:
+            backend = backends.get_backend(type(self).BACKEND)
+            value = _column(backend, datum, value, len(self))
+        self._columns[name] = value
 
     # Serializing
 
-    def to_line_protocol(self):
+    def to_line_protocol(self, workers=None, precision="ns"):
         """
         Serializes the underlying dataframe into the InfluxDB line protocol
 
+        :param workers: The number of worker processes to split the rows
+            across, or `None` to serialize them in this process
+        :param precision: The precision of the timestamps, one of "ns", "u",
+            "ms" or "s".  Writes must specify the same precision
         :return: A string
         """
-        # Create the measurement+tags prototype
-        tags = []
-        tags_prototype = []
-        for attname, tag in self.tags.items():
-            if tag.required:
-                if self.data_frame[attname].isnull().values.any():
-                    raise MissingTagError(
-                        "Required tag \"{}\" not provided".format(attname)
-                    )
-
-            tags.append(tag)
-            tags_prototype.append("{tag_name}=%s".format(
-                tag_name=tag.db_name
-            ))
-
-        # Create the fields prototype
-        fields = []
-        fields_prototype = []
-        for attname, field in self.fields.items():
-            # First, do a check for missing required fields
-            if field.required:
-                if self.data_frame[attname].isnull().values.any():
-                    raise MissingFieldError(
-                        "Required field \"{}\" not provided".format(attname)
-                    )
-
-            fields.append(field)
-            fields_prototype.append("{field_name}=%s".format(
-                field_name=field.db_name
-            ))
-
-        # Generate the line protocol string from the above prototypes
-        num_tags = len(tags)
-        return "\n".join([
-            " ".join([
-                ','.join([self.__class__.__name__] + [
-                    prototype % tag.format(item)
-                    for tag, prototype, item in zip(
-                        tags,
-                        tags_prototype,
-                        row[0:num_tags]
-                    )
-                    if item is not None
-                ])
-            ] + [
-                ",".join([
-                    prototype % field.format(item)
-                    for field, prototype, item in zip(
-                        fields,
-                        fields_prototype,
-                        row[num_tags:]
-                    )
-                    if item is not None
-                ])
-            ] + [
-                str(row.time.value) if row.time else ""
-            ]) for row in self.data_frame.itertuples(index=False)
-        ])
+        self._serializer.check_required(self._columns)
+        if workers is not None:
+            return line_protocol.format_parallel(
+                self._serializer,
+                self._columns,
+                workers,
+                precision
+            )
+        return "\n".join(
+            self._serializer.format_lines(self._columns, precision).tolist()
+        )
+
+    def iter_line_protocol(self, max_lines=5000, max_bytes=None, workers=None,
+                           precision="ns"):
+        """
+        Serializes the underlying dataframe into the InfluxDB line protocol,
+        in batches suitable for individual writes.  Rows are serialized as the
+        batches are consumed, so memory usage tracks the batch size rather
+        than the size of the dataframe
+
+        :param max_lines: The maximum number of points per batch, or `None`
+        :param max_bytes: The maximum UTF-8 encoded size of a batch, or `None`
+        :param workers: The number of worker processes serializing batches
+            ahead of the consumer, or `None` to serialize them in this process
+        :param precision: The precision of the timestamps
+        :return: A generator of strings
+        """
+        self._serializer.check_required(self._columns)
+        batches = line_protocol.iter_batches(
+            self._serializer,
+            self._columns,
+            max_lines=max_lines,
+            max_bytes=max_bytes,
+            workers=workers,
+            precision=precision
+        )
+        return ("\n".join(batch.tolist()) for batch in batches)
+
+    def write_line_protocol(self, fp, precision="ns"):
+        """
+        Serializes the underlying dataframe into the InfluxDB line protocol,
+        writing UTF-8 encoded bytes directly into `fp` one batch at a time.
+        The full payload is never materialized as a string
+
+        :param fp: A binary file object (including `io.BytesIO`), a socket or
+            a `bytearray`
+        :param precision: The precision of the timestamps
+        :return: The number of bytes written
+        """
+        write = line_protocol.binary_writer(fp)
+        num_bytes = 0
+        batches = self.iter_line_protocol(
+            max_lines=line_protocol.CHUNK_SIZE,
+            precision=precision
+        )
+        for index, batch in enumerate(batches):
+            if index:
+                write(b"\n")
+                num_bytes += 1
+            payload = batch.encode()
+            write(payload)
+            num_bytes += len(payload)
+        return num_bytes
+
+    def to_line_protocol_bytes(self, precision="ns"):
+        """
+        Serializes the underlying dataframe into UTF-8 encoded InfluxDB line
+        protocol
+
+        :param precision: The precision of the timestamps
+        :return: A bytes object
+        """
+        buffer = io.BytesIO()
+        self.write_line_protocol(buffer, precision)
+        return buffer.getvalue()
+
+    def to_line_protocol_gzip(self, compresslevel=6, precision="ns"):
+        """
+        Serializes the underlying dataframe into gzip compressed InfluxDB line
+        protocol, suitable for writes sent with `Content-Encoding: gzip`.
+        Batches are compressed as they are serialized
+
+        :param compresslevel: The compression level, from 0 to 9
+        :param precision: The precision of the timestamps
+        :return: A bytes object
+        """
+        buffer = io.BytesIO()
+        with line_protocol.GzipWriter(buffer, compresslevel) as writer:
+            self.write_line_protocol(writer, precision)
+        return buffer.getvalue()
+
+    def iter_line_protocol_gzip(self, max_lines=5000, max_bytes=None,
+                                compresslevel=6, precision="ns"):
+        """
+        Same as `iter_line_protocol`, but each batch is yielded as its own
+        gzip member, ready to be sent with `Content-Encoding: gzip`
+
+        :param max_lines: The maximum number of points per batch, or `None`
+        :param max_bytes: The maximum uncompressed size of a batch, or `None`
+        :param compresslevel: The compression level, from 0 to 9
+        :param precision: The precision of the timestamps
+        :return: A generator of bytes objects
+        """
+        batches = self.iter_line_protocol(
+            max_lines=max_lines,
+            max_bytes=max_bytes,
+            precision=precision
+        )
+        return (
+            gzip.compress(batch.encode(), compresslevel=compresslevel)
+            for batch in batches
+        )
 
     # Querying
 
@@ -336,7 +575,7 @@ class Measurement(metaclass=MeasurementMeta):
             measurement_name = cls.__name__
 
         query_string = "SELECT {parameters} FROM {measurement_name}".format(
-            parameters=",".join(datum.db_name for datum in cls.tags_and_fields.values()),
+            parameters=",".join(cls.schema.db_names.values()),
             measurement_name=measurement_name
         )
 
@@ -354,3 +593,71 @@ class Measurement(metaclass=MeasurementMeta):
                 query_string += " OFFSET {}".format(int(offset))
 
         return query_string
+
+    @classmethod
+    def make_query_params(cls, *, epoch=None, **kwargs):
+        """
+        Builds the HTTP parameters of a query to InfluxDB's `/query` endpoint.
+        Querying with an `epoch` makes InfluxDB return integer timestamps,
+        which `from_json` (given the same `epoch`) ingests without any parsing
+
+        :param epoch: The precision of the returned timestamps ("ns", "u",
+            "ms" or "s"), or `None` for RFC3339 timestamps
+        :param kwargs: The arguments of `make_query_string`
+        :return: A `dict` of parameters
+        """
+        params = dict(q=cls.make_query_string(**kwargs))
+        if epoch is not None:
+            util.nanoseconds_per(epoch)
+            params["epoch"] = epoch
+        return params
+
+
+def _num_rows(values):
+    """
+    Infers the number of rows of a measurement from its constructor's
+    arguments.  Scalars are broadcast, so the first array-like determines the
+    length, falling back to a single row if there are only scalars, and no
+    rows at all if every argument is `None`
+    """
+    num_rows = 0
+    for value in values:
+        if value is None:
+            continue
+        if np.ndim(value) > 0:
+            return len(value)
+        num_rows = 1
+    return num_rows
+
+
+def _column(backend, datum, values, num_rows):
+    """
+    Allocates a column of a tag or field, coerced once into its dtype
+    """
+    if values is None:
+        return backend.empty(datum, num_rows)
+    if np.ndim(values) == 0:
+        values = np.full(num_rows, values, dtype=object)
+    elif isinstance(values, np.ndarray) and values.dtype.kind == "S":
+        # e.g. the fixed width byte strings of structured arrays
+        values = np.char.decode(values, "utf-8")
+    return backend.coerce(datum, values)
+
+
+def _time_column(time, num_rows):
+    """
+    Converts timestamps into a `datetime64[ns]` column.  Columns which are
+    already `datetime64[ns]`, or are integer nanoseconds, are not copied.  An
+    unset time column, e.g. as exported by `to_columns`, stays unset
+    """
+    if time is None:
+        return np.full(num_rows, None, dtype=object)
+    if isinstance(time, np.ndarray):
+        if time.dtype == np.int64:
+            return time.view("datetime64[ns]")
+        if time.dtype == object and np.equal(time, None).all():
+            return time
+    time = np.asarray(time, dtype="datetime64[ns]")
+    if time.ndim == 0:
+        time = np.full(num_rows, time)
+    return time
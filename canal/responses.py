@@ -0,0 +1,601 @@
+"""
+Columnar decoding of InfluxDB query responses
+
+Rather than building a DataFrame a row at a time, each column of a series'
+`values` is extracted once and converted in bulk to the dtype its tag or field
+declares.  CSV responses are read by pandas' C parser with those same dtypes.
+"""
+import collections
+import concurrent.futures
+import contextlib
+import csv
+import functools
+import gc
+import importlib
+import io
+import re
+import struct
+
+import numpy as np
+
+from . import backends, line_protocol, util
+from .datum import BooleanField, IntegerField
+
+pd = util.LazyModule("pandas")
+
+
+def iter_series(content):
+    """
+    Iterates over every series within a decoded JSON query response
+
+    :param content: A decoded JSON response, i.e. a `dict` holding either a
+        list of `results`, a list of `series`, or a single series
+    :return: A generator of series dicts
+    """
+    if "results" in content:
+        for result in content["results"]:
+            yield from result.get("series", [])
+    elif "series" in content:
+        yield from content["series"]
+    elif "name" in content:
+        yield content
+
+
+def group_series(content, schema):
+    """
+    Groups the series of a measurement within a decoded JSON query response
+    by the statement which returned them and their tag set, i.e. the tags
+    they were grouped by
+
+    :param content: A decoded JSON response
+    :param schema: The `Schema` of the measurement
+    :return: An `OrderedDict` mapping `(statement_id, tags)` pairs, where
+        `tags` is a sorted tuple of `(tag, value)` pairs, `value` being `None`
+        for an empty tag, to lists of series, in the order they appear within
+        the response
+    """
+    if "results" in content:
+        results = content["results"]
+    else:
+        results = [content]
+
+    groups = collections.OrderedDict()
+    for index, result in enumerate(results):
+        statement_id = result.get("statement_id", index)
+        for series in iter_series(result):
+            if series.get("name", None) != schema.name:
+                continue
+            # Empty tags are `None`, as they are within the decoded columns
+            tags = tuple(sorted(
+                (key, value if value != "" else None)
+                for key, value in (series.get("tags") or {}).items()
+            ))
+            groups.setdefault((statement_id, tags), []).append(series)
+    return groups
+
+
+def _decode_group(group, schema, epoch):
+    return decode_merged(dict(series=group), schema, epoch)
+
+
+def decode_groups(groups, schema, epoch=None, workers=None, processes=False):
+    """
+    Decodes groups of series, as returned by `group_series`, optionally
+    spreading them across a pool of workers
+
+    :param groups: A sequence of lists of series
+    :param schema: The `Schema` of the measurement
+    :param epoch: The precision of integer timestamps, or `None`
+    :param workers: The number of worker threads or processes, or `None` to
+        decode every group within the calling thread
+    :param processes: Whether to decode with worker processes rather than
+        threads.  Processes avoid contention over the GIL, but must be sent
+        each group and return its columns
+    :return: A list of `(time, columns)` pairs, as per `decode_series`, in
+        the order of `groups`
+    """
+    decode = functools.partial(_decode_group, schema=schema, epoch=epoch)
+    if workers is None or workers < 2 or len(groups) < 2:
+        return [decode(group) for group in groups]
+
+    if processes:
+        executor = concurrent.futures.ProcessPoolExecutor(max_workers=workers)
+        # Send a few groups per task, to amortize the cost of each round trip
+        chunksize = max(1, len(groups) // (4 * workers))
+    else:
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers)
+        chunksize = 1
+    with executor:
+        return list(executor.map(decode, groups, chunksize=chunksize))
+
+
+def iter_documents(source):
+    """
+    Decodes a stream of newline-delimited JSON documents, such as a response
+    to an InfluxDB query made with `chunked=true`.  Each document is decoded
+    as soon as its final chunk arrives
+
+    :param source: A string, a bytes-like object, a (text or binary) file
+        object, or an iterable of string or bytes chunks
+    :return: A generator of decoded documents
+    """
+    remainder = None
+    for chunk in line_protocol.iter_chunks(source):
+        data = chunk if remainder is None else remainder + chunk
+        newline = b"\n" if isinstance(data, bytes) else "\n"
+        end = data.rfind(newline)
+        if end < 0:
+            remainder = data
+            continue
+        complete, remainder = data[:end], data[end + 1:]
+        for document in complete.split(newline):
+            if document.strip():
+                yield _loads(document)
+    if remainder is not None and remainder.strip():
+        yield _loads(remainder)
+
+
+def _check_errors(content):
+    errors = [content.get("error")] + [
+        result.get("error") for result in content.get("results", [])
+    ]
+    for error in errors:
+        if error is not None:
+            raise ValueError("Query failed: {}".format(error))
+    return content
+
+
+def _loads(document):
+    return _check_errors(json_loads(document))
+
+
+#: The modules which may decode JSON, fastest first.  Each provides a
+#: `loads` function accepting both `str` and `bytes`
+JSON_BACKENDS = ("orjson", "simdjson", "ujson", "json")
+
+_json_decoder = None
+
+
+def json_backend():
+    """
+    Returns the name of the fastest installed JSON decoder, out of
+    `JSON_BACKENDS`
+    """
+    global _json_decoder
+    if _json_decoder is None:
+        for name in JSON_BACKENDS:
+            try:
+                _json_decoder = name, importlib.import_module(name).loads
+                break
+            except ImportError:
+                continue
+    return _json_decoder[0]
+
+
+@contextlib.contextmanager
+def paused_gc():
+    """
+    Pauses the cyclic garbage collector.  Decoding a response allocates a
+    container per row, which otherwise triggers repeated full collections,
+    even though the decoded tree can hold no reference cycles
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def json_loads(document):
+    """
+    Decodes a JSON document with the fastest installed decoder
+
+    :param document: A `str` or bytes-like object
+    :return: The decoded document
+    """
+    if _json_decoder is None:
+        json_backend()
+    if isinstance(document, (bytearray, memoryview)):
+        document = bytes(document)
+    with paused_gc():
+        return _json_decoder[1](document)
+
+
+def read_json(content):
+    """
+    Decodes a JSON query response, unless it's already been decoded
+
+    :param content: A decoded response, i.e. a `dict`, or a `str`, a
+        bytes-like object or a (text or binary) file object holding one
+    :return: The decoded response
+    """
+    if isinstance(content, dict):
+        return content
+    if hasattr(content, "read"):
+        content = content.read()
+    return _check_errors(json_loads(content))
+
+
+def parse_times(times, epoch=None):
+    """
+    Converts a column of query response timestamps into `datetime64[ns]`
+
+    :param times: A sequence of RFC3339 strings, or of integers if the query
+        was made with an `epoch` parameter
+    :param epoch: The precision of integer timestamps, or `None`
+    :return: A `numpy.ndarray` of `datetime64[ns]`
+    """
+    if epoch is not None:
+        # Integer timestamps need no parsing: the int64 buffer is scaled to
+        # nanoseconds in place and reinterpreted as datetime64[ns]
+        scale = util.nanoseconds_per(epoch)
+        nanoseconds = np.fromiter(times, dtype=np.int64, count=len(times))
+        if scale != 1:
+            nanoseconds *= scale
+        return nanoseconds.view("datetime64[ns]")
+    return util.datetime64_from_influx_times(times)
+
+
+def _extract_series(series, schema):
+    """
+    Extracts the raw columns of a single series, returning a `(num_rows,
+    time, columns, constants)` tuple, where `columns` maps names to lists of
+    values and `constants` maps the names of the tags the series was grouped
+    by to their value
+    """
+    values = series.get("values") or []
+
+    time = None
+    columns = {}
+    for index, column_name in enumerate(series["columns"]):
+        # Extract each column with a comprehension rather than `zip(*values)`,
+        # which allocates an iterator per row and so repeatedly triggers the
+        # garbage collector on large responses
+        column = [row[index] for row in values]
+        if column_name == "time":
+            time = column
+        else:
+            columns[schema.resolve(column_name)[0]] = column
+
+    # InfluxDB reports a GROUP BY tag which a series lacks as an empty string
+    constants = {
+        schema.resolve(key)[0]: value if value != "" else None
+        for key, value in (series.get("tags") or {}).items()
+    }
+    return len(values), time, columns, constants
+
+
+def decode_series(series, schema, epoch=None):
+    """
+    Decodes the columns of a single series.  The values of any tags the
+    series was grouped by fill their own columns
+
+    :param series: A series dict, holding `columns`, `values`, and optionally
+        `tags`
+    :param schema: The `Schema` of the measurement
+    :param epoch: The precision of integer timestamps, or `None` for RFC3339
+        timestamps
+    :return: A `(time, columns)` pair, where `columns` maps column names to
+        `numpy.ndarray` columns, or `backends.CodedColumn` columns for the
+        tags the series was grouped by
+    """
+    num_rows, time, columns, constants = _extract_series(series, schema)
+    if time is not None:
+        time = parse_times(time, epoch)
+    columns = {
+        name: schema.tags_and_fields[name].to_array(column)
+        for name, column in columns.items()
+    }
+    for name, value in constants.items():
+        columns[name] = backends.CodedColumn(
+            np.full(num_rows, -1 if value is None else 0),
+            [] if value is None else [value]
+        )
+    return time, columns
+
+
+def iter_decoded(content, schema, epoch=None):
+    """
+    Decodes every series of a measurement within a decoded JSON response
+
+    :param content: A decoded JSON response
+    :param schema: The `Schema` of the measurement
+    :param epoch: The precision of integer timestamps, or `None`
+    :return: A generator of `(time, columns)` pairs, as per `decode_series`
+    """
+    for series in iter_series(content):
+        if series.get("name", None) == schema.name:
+            yield decode_series(series, schema, epoch)
+
+
+def decode_merged(content, schema, epoch=None):
+    """
+    Decodes every series of a measurement within a decoded JSON response,
+    e.g. one series per tag set for a `GROUP BY` query, into a single set of
+    columns.  The raw values of every series are gathered first, so each
+    column is converted only once, and the values of grouped tags are encoded
+    with one code per series
+
+    :param content: A decoded JSON response
+    :param schema: The `Schema` of the measurement
+    :param epoch: The precision of integer timestamps, or `None`
+    :return: A `(time, columns)` pair, as per `decode_series`, or `None` if
+        the response holds no series of the measurement
+    """
+    extracted = [
+        _extract_series(series, schema)
+        for series in iter_series(content)
+        if series.get("name", None) == schema.name
+    ]
+    if not extracted:
+        return None
+
+    bounds = np.cumsum([0] + [num_rows for num_rows, _, _, _ in extracted])
+    num_rows = bounds[-1]
+
+    def gather(parts):
+        gathered = []
+        for (rows, _, _, _), part in zip(extracted, parts):
+            gathered.extend([None] * rows if part is None else part)
+        return gathered
+
+    times = [time for _, time, _, _ in extracted]
+    time = None
+    if any(part is not None for part in times):
+        time = parse_times(gather(times), epoch)
+
+    columns = {}
+    constants = {}
+    for _, _, series_columns, series_constants in extracted:
+        columns.update(dict.fromkeys(series_columns))
+        constants.update(dict.fromkeys(series_constants))
+    for attname in columns:
+        columns[attname] = schema.tags_and_fields[attname].to_array(gather(
+            series_columns.get(attname)
+            for _, _, series_columns, _ in extracted
+        ))
+
+    for attname in constants:
+        if attname not in columns:
+            # Grouped tags are encoded once per series, rather than per row
+            values = [
+                series_constants.get(attname)
+                for _, _, _, series_constants in extracted
+            ]
+            categories = collections.OrderedDict()
+            codes = [
+                -1 if value is None else categories.setdefault(value, len(categories))
+                for value in values
+            ]
+            columns[attname] = backends.CodedColumn(
+                np.repeat(codes, np.diff(bounds)),
+                list(categories)
+            )
+            continue
+        merged = columns[attname].astype(object)
+        for start, stop, (_, _, series_columns, series_constants) in zip(
+                bounds, bounds[1:], extracted):
+            if attname in series_constants:
+                merged[start:stop] = series_constants[attname]
+        columns[attname] = merged
+    return time, columns
+
+
+# CSV responses
+
+#: InfluxDB separates the sections of a CSV response, which it starts
+#: whenever the columns change, with a blank line and a new header
+_csv_section = re.compile(rb"\r?\n\r?\n(?=name,tags,)")
+
+
+def _read_bytes(content):
+    chunks = [
+        chunk.encode() if isinstance(chunk, str) else chunk
+        for chunk in line_protocol.iter_chunks(content)
+    ]
+    return b"".join(chunks)
+
+
+def _parse_tag_sets(tag_sets, schema):
+    """
+    Parses the `tags` column of a CSV response, which holds the tag set a
+    `GROUP BY` query grouped each row by as "key=value,key=value", into
+    object columns.  Each distinct tag set is only parsed once
+    """
+    codes, uniques = pd.factorize(tag_sets)
+    if not len(uniques) or (len(uniques) == 1 and uniques[0] == ""):
+        return {}
+
+    parsed = []
+    for tag_set in uniques:
+        parsed.append(dict(
+            pair.split("=", 1) for pair in tag_set.split(",") if pair
+        ))
+    keys = set().union(*parsed)
+    columns = {}
+    for key in keys:
+        values = np.array(
+            [tags.get(key) or None for tags in parsed] + [None],
+            dtype=object
+        )
+        # Missing tag sets have a code of -1, so select the trailing `None`
+        columns[schema.resolve(key)[0]] = values[codes]
+    return columns
+
+
+def _csv_column(datum, values):
+    """
+    Converts a column which `read_csv` could not give the datum's dtype,
+    because it has missing values, or a column of strings into an object
+    column holding `None` for missing values
+    """
+    column = np.full(len(values), None, dtype=object)
+    present = ~pd.isnull(values)
+    if isinstance(datum, IntegerField):
+        column[present] = values[present].astype(np.int64)
+    elif isinstance(datum, BooleanField):
+        column[present] = np.isin(
+            values[present].astype(str),
+            ("t", "T", "true", "True", "TRUE")
+        )
+    else:
+        column[present] = values[present]
+    return column
+
+
+def _decode_csv_section(section, schema, epoch):
+    header = next(csv.reader([section.split(b"\n", 1)[0].decode()]))
+    if header[:2] != ["name", "tags"]:
+        raise ValueError("Invalid CSV")
+
+    data_columns = {}
+    for column_name in header[2:]:
+        if column_name != "time":
+            data_columns[column_name] = schema.resolve(column_name)
+    dtypes = dict(name=object, tags=object, time=np.int64)
+    dtypes.update({
+        column_name: datum.dtype
+        for column_name, (_, datum) in data_columns.items()
+    })
+
+    def read(dtypes):
+        return pd.read_csv(
+            io.BytesIO(section),
+            dtype=dtypes,
+            keep_default_na=False,
+            na_values=[""],
+            true_values=["true"],
+            false_values=["false"],
+            engine="c"
+        )
+
+    # Integer and boolean columns holding missing values can't be read with
+    # their dtype, nor can RFC3339 timestamps be read as integers
+    relaxed = {
+        column_name: dtype if dtype == np.float64 else object
+        for column_name, dtype in dtypes.items()
+    }
+    try:
+        data_frame = read(dtypes)
+    except ValueError:
+        try:
+            data_frame = read(dict(relaxed, time=np.int64))
+        except ValueError:
+            data_frame = read(relaxed)
+
+    names = data_frame["name"].values
+    if not (names == schema.name).all():
+        data_frame = data_frame[names == schema.name]
+    num_rows = len(data_frame)
+
+    time = None
+    if "time" in data_frame:
+        time = data_frame["time"].values
+        if time.dtype == np.int64:
+            time = time * util.nanoseconds_per(epoch)
+            time = time.view("datetime64[ns]")
+        else:
+            time = util.datetime64_from_influx_times(
+                np.where(pd.isnull(time), None, time)
+            )
+
+    columns = {}
+    for column_name, (attname, datum) in data_columns.items():
+        values = data_frame[column_name].values
+        if values.dtype != datum.dtype or values.dtype == object:
+            values = _csv_column(datum, values)
+        columns[attname] = values
+    columns.update(_parse_tag_sets(
+        data_frame["tags"].fillna("").values,
+        schema
+    ))
+    return num_rows, time, columns
+
+
+def decode_csv(content, schema, epoch="ns"):
+    """
+    Decodes every row of a measurement within a CSV query response, i.e. a
+    response to a query made with `Accept: application/csv`
+
+    :param content: A string, a bytes-like object, a (text or binary) file
+        object, or an iterable of string or bytes chunks
+    :param schema: The `Schema` of the measurement
+    :param epoch: The precision of the integer timestamps
+    :return: A `(time, columns)` pair, as per `decode_series`
+    """
+    util.nanoseconds_per(epoch)
+    blocks = [
+        _decode_csv_section(section, schema, epoch)
+        for section in _csv_section.split(_read_bytes(content))
+        if section.strip()
+    ]
+    num_rows, time, columns = line_protocol.concatenate_blocks(blocks)
+    if time is None and not num_rows:
+        time = np.empty(0, dtype="datetime64[ns]")
+    return time, columns
+
+
+# MessagePack responses
+
+#: The extension type InfluxDB encodes timestamps with, holding big-endian
+#: seconds (int64) and nanoseconds (uint32) since the epoch
+_influx_time_ext = 5
+#: MessagePack's own timestamp extension type
+_msgpack_time_ext = -1
+
+
+def _time_ext_hook(code, data):
+    """
+    Decodes timestamp extensions to integer nanoseconds since the epoch, so
+    they can be converted as a column like timestamps from queries made with
+    an `epoch`
+    """
+    if code == _influx_time_ext and len(data) == 12:
+        seconds, nanoseconds = struct.unpack(">qI", data)
+    elif code == _msgpack_time_ext and len(data) == 4:
+        seconds, = struct.unpack(">I", data)
+        nanoseconds = 0
+    elif code == _msgpack_time_ext and len(data) == 8:
+        value, = struct.unpack(">Q", data)
+        seconds, nanoseconds = value & 0x3ffffffff, value >> 34
+    elif code == _msgpack_time_ext and len(data) == 12:
+        nanoseconds, seconds = struct.unpack(">Iq", data)
+    else:
+        import msgpack
+        return msgpack.ExtType(code, data)
+    return seconds * 10**9 + nanoseconds
+
+
+def iter_msgpack_documents(source):
+    """
+    Decodes a stream of MessagePack documents, such as a response to a query
+    made with `Accept: application/x-msgpack`.  This requires the optional
+    msgpack package
+
+    :param source: A bytes-like object, a binary file object, or an iterable
+        of bytes chunks
+    :return: A generator of decoded documents
+    """
+    try:
+        import msgpack
+    except ImportError:
+        raise ImportError(
+            "Decoding MessagePack responses requires the msgpack package"
+        )
+    try:
+        # msgpack >= 1.0 decodes its own timestamps, here as nanoseconds
+        unpacker = msgpack.Unpacker(
+            raw=False,
+            ext_hook=_time_ext_hook,
+            timestamp=2
+        )
+    except TypeError:
+        unpacker = msgpack.Unpacker(raw=False, ext_hook=_time_ext_hook)
+    for chunk in line_protocol.iter_chunks(source):
+        unpacker.feed(chunk)
+        with paused_gc():
+            documents = list(unpacker)
+        for document in documents:
+            yield _check_errors(document)
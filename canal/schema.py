@@ -0,0 +1,88 @@
+import collections
+import types
+
+
+class Schema(object):
+    """
+    The frozen schema of a measurement class, i.e. its tags and fields, how
+    their attribute names map to and from their names within the database,
+    their dtypes, and the order of the columns.  One is built per class, when
+    the class is created, and shared by serialization and deserialization
+    """
+
+    __slots__ = (
+        "name",
+        "tags",
+        "fields",
+        "tags_and_fields",
+        "db_names",
+        "tags_by_db_name",
+        "fields_by_db_name",
+        "by_db_name",
+        "dtypes",
+        "columns",
+    )
+
+    def __init__(self, name, tags, fields):
+        """
+        :param name: The name of the measurement
+        :param tags: A mapping of attribute names to `Tag` instances
+        :param fields: A mapping of attribute names to `Field` instances
+        """
+        def frozen(items):
+            return types.MappingProxyType(collections.OrderedDict(items))
+
+        def by_db_name(data):
+            return frozen(
+                (datum.db_name, (attname, datum))
+                for attname, datum in data.items()
+            )
+
+        set_attribute = super().__setattr__
+        set_attribute("name", name)
+        set_attribute("tags", frozen(sorted(tags.items())))
+        set_attribute("fields", frozen(sorted(fields.items())))
+        set_attribute("tags_and_fields", frozen(sorted(
+            list(tags.items()) + list(fields.items())
+        )))
+        set_attribute("db_names", frozen(
+            (attname, datum.db_name)
+            for attname, datum in self.tags_and_fields.items()
+        ))
+        set_attribute("tags_by_db_name", by_db_name(self.tags))
+        set_attribute("fields_by_db_name", by_db_name(self.fields))
+        set_attribute("by_db_name", by_db_name(self.tags_and_fields))
+        set_attribute("dtypes", frozen(
+            (attname, datum.dtype)
+            for attname, datum in self.tags_and_fields.items()
+        ))
+        set_attribute("columns", tuple(self.tags) + tuple(self.fields) + ("time",))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Schemas are immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("Schemas are immutable")
+
+    def __reduce__(self):
+        return Schema, (self.name, dict(self.tags), dict(self.fields))
+
+    def __repr__(self):
+        return "Schema({!r}, tags={}, fields={})".format(
+            self.name,
+            list(self.tags),
+            list(self.fields)
+        )
+
+    def resolve(self, db_name):
+        """
+        Returns the attribute name and `Datum` of a tag or field
+
+        :param db_name: The name of the tag or field within the database
+        :return: An `(attname, datum)` pair
+        """
+        try:
+            return self.by_db_name[db_name]
+        except KeyError:
+            raise ValueError("Unrecognized column name {}".format(db_name))
+
@@ -0,0 +1,188 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+import canal as canal
+
+from .util import NumpyTestCase
+
+
+class NumpyBackendTestCase(NumpyTestCase):
+    class Measurement(canal.Measurement):
+        BACKEND = "numpy"
+        int_field = canal.IntegerField()
+        float_field = canal.FloatField()
+        bool_field = canal.BooleanField()
+        string_field = canal.StringField()
+        tag_1 = canal.Tag()
+        tag_2 = canal.Tag()
+
+    class FrameMeasurement(Measurement):
+        BACKEND = "pandas"
+
+    COLUMNS = dict(
+        time=np.arange(4).astype("datetime64[s]"),
+        int_field=[1, None, 3, 4],
+        float_field=[1.5, 2.5, None, 4.5],
+        bool_field=[True, False, True, None],
+        string_field=["a", "b", "c", "d"],
+        tag_1=["x y", "x y", None, "z"],
+        tag_2="constant"
+    )
+
+    def test_columns(self):
+        test_series = self.Measurement(**self.COLUMNS)
+        self.assertIsInstance(test_series._columns, canal.backends.ArrayColumns)
+        self.assertEqual(len(test_series), 4)
+        self.assertEqual(list(test_series.int_field), [1, None, 3, 4])
+        self.assertEqual(test_series.float_field.dtype, np.float64)
+        self.assertTrue(np.isnan(test_series.float_field[2]))
+        self.assertEqual(list(test_series.tag_1), ["x y", "x y", None, "z"])
+        self.assertEqual(list(test_series.tag_2), 4*["constant"])
+        self.assertndArrayEqual(
+            test_series.time,
+            np.arange(4).astype("datetime64[s]").astype("datetime64[ns]")
+        )
+
+    def test_dtypes(self):
+        test_series = self.Measurement(
+            int_field=np.arange(3),
+            float_field=[1, 2, 3],
+            bool_field=np.ones(3, dtype=bool)
+        )
+        self.assertEqual(test_series.int_field.dtype, np.int64)
+        self.assertEqual(test_series.float_field.dtype, np.float64)
+        self.assertEqual(test_series.bool_field.dtype, np.bool_)
+        self.assertEqual(test_series.tag_1.dtype, object)
+
+    def test_line_protocol_matches_pandas(self):
+        def serialize(measurement_class, **kwargs):
+            return measurement_class(**self.COLUMNS).to_line_protocol(**kwargs).replace(
+                measurement_class.__name__,
+                "Measurement"
+            )
+
+        for kwargs in (dict(), dict(precision="s")):
+            self.assertEqual(
+                serialize(self.Measurement, **kwargs),
+                serialize(self.FrameMeasurement, **kwargs)
+            )
+
+    def test_attributes_match_pandas(self):
+        def attribute(measurement_class, name, **columns):
+            # Missing values are NaN within pandas columns, and None otherwise
+            return [
+                None if value is None or value != value else value
+                for value in list(getattr(measurement_class(**columns), name))
+            ]
+
+        for name, values in [
+            ("int_field", [1, None, 3.0]),
+            ("float_field", [1, None, 2.5]),
+            ("bool_field", [True, None, 0]),
+            ("string_field", ["a", None, 1]),
+            ("tag_1", [1, None, "x y"]),
+            ("tag_1", [None, None, None]),
+        ] + [(name, values) for name, values in self.COLUMNS.items() if name != "time"]:
+            self.assertEqual(
+                attribute(self.Measurement, name, **{name: values}),
+                attribute(self.FrameMeasurement, name, **{name: values})
+            )
+        self.assertEqual(list(self.Measurement(tag_1=[1, None]).tag_1), ["1", None])
+
+        for name, values in [
+            ("int_field", [1.0, np.inf]),
+            ("int_field", ["a"]),
+            ("bool_field", ["false"]),
+        ]:
+            for measurement_class in (self.Measurement, self.FrameMeasurement):
+                with self.assertRaises(ValueError):
+                    measurement_class(**{name: values})
+
+    def test_data_frame(self):
+        data_frame = self.Measurement(**self.COLUMNS).data_frame
+        self.assertIsInstance(data_frame, pd.DataFrame)
+        self.assertEqual(
+            list(data_frame.columns),
+            list(self.Measurement.schema.columns)
+        )
+        self.assertEqual(list(data_frame["string_field"]), ["a", "b", "c", "d"])
+
+    def test_rec_array(self):
+        rec_array = self.Measurement(**self.COLUMNS).rec_array
+        self.assertEqual(rec_array.dtype.names, self.Measurement.schema.columns)
+        self.assertEqual(list(rec_array.string_field), ["a", "b", "c", "d"])
+
+    def test_setters(self):
+        test_series = self.Measurement(**self.COLUMNS)
+        test_series.int_field = [5, 6, 7, 8]
+        self.assertEqual(test_series.int_field.dtype, np.int64)
+        test_series.time = None
+        self.assertEqual(list(test_series.time), 4*[None])
+        with self.assertRaises(ValueError):
+            test_series.int_field = [1, 2]
+
+    def test_length_mismatch(self):
+        with self.assertRaises(ValueError):
+            self.Measurement(int_field=[1, 2], float_field=[1.5])
+
+    def test_required(self):
+        class Measurement(canal.Measurement):
+            BACKEND = "numpy"
+            required_float = canal.FloatField(required=True)
+            required_tag = canal.Tag(required=True)
+
+        with self.assertRaises(canal.MissingFieldError):
+            Measurement(required_float=[1.5, np.nan], required_tag="a").to_line_protocol()
+        with self.assertRaises(canal.MissingTagError):
+            Measurement(required_float=[1.5, 2.5], required_tag=["a", None]).to_line_protocol()
+
+    def test_from_json(self):
+        test_series = self.Measurement.from_json(dict(
+            name="Measurement",
+            tags=dict(tag_2="a"),
+            columns=["time", "int_field", "tag_1"],
+            values=[
+                ["2015-01-29T21:55:43Z", 1, None],
+                ["2015-01-29T21:55:44Z", None, "y"]
+            ]
+        ))
+        self.assertIsInstance(test_series._columns, canal.backends.ArrayColumns)
+        self.assertEqual(list(test_series.int_field), [1, None])
+        self.assertEqual(list(test_series.tag_1), [None, "y"])
+        self.assertEqual(list(test_series.tag_2), ["a", "a"])
+
+    def test_batch(self):
+        batch = canal.Batch([
+            self.Measurement(**self.COLUMNS),
+            self.FrameMeasurement(**self.COLUMNS)
+        ])
+        self.assertEqual(
+            batch.to_line_protocol(interleave=True).splitlines(),
+            [
+                line.replace("FrameMeasurement", name)
+                for line in self.FrameMeasurement(**self.COLUMNS).to_line_protocol().splitlines()
+                for name in ("Measurement", "FrameMeasurement")
+            ]
+        )
+
+
+class BackendSelectionTestCase(unittest.TestCase):
+    def tearDown(self):
+        canal.set_default_backend("pandas")
+
+    def test_default_backend(self):
+        class Measurement(canal.Measurement):
+            int_field = canal.IntegerField()
+
+        self.assertIsInstance(Measurement(int_field=[1])._columns, canal.backends.FrameColumns)
+        canal.set_default_backend("numpy")
+        self.assertIsInstance(Measurement(int_field=[1])._columns, canal.backends.ArrayColumns)
+
+    def test_unrecognized_backend(self):
+        with self.assertRaises(ValueError):
+            canal.set_default_backend("arrow")
+        with self.assertRaises(ValueError):
+            class Measurement(canal.Measurement):
+                BACKEND = "arrow"
@@ -0,0 +1,105 @@
+import unittest
+
+import numpy as np
+
+import canal as canal
+
+
+class BatchTestCase(unittest.TestCase):
+    class First(canal.Measurement):
+        int_field = canal.IntegerField()
+        tag = canal.Tag()
+
+    class Second(canal.Measurement):
+        float_field = canal.FloatField(required=True)
+
+    def setUp(self):
+        self.first = self.First(
+            time=np.arange(0, 3000, 2).astype("datetime64[s]"),
+            int_field=np.arange(1500),
+            tag="a tag"
+        )
+        self.second = self.Second(
+            time=np.arange(1, 3000, 3).astype("datetime64[s]"),
+            float_field=np.arange(1000) / 2
+        )
+        self.batch = canal.Batch([self.first, self.second])
+
+    def test_length(self):
+        self.assertEqual(len(self.batch), 2500)
+        self.batch.clear()
+        self.assertEqual(len(self.batch), 0)
+
+    def test_add(self):
+        batch = canal.Batch()
+        batch.add(self.first)
+        batch.add(self.second)
+        self.assertEqual(batch.measurements, [self.first, self.second])
+
+    def test_to_line_protocol(self):
+        self.assertEqual(
+            self.batch.to_line_protocol(),
+            self.first.to_line_protocol() + "\n" + self.second.to_line_protocol()
+        )
+
+    def test_shared_batches(self):
+        batches = list(self.batch.iter_line_protocol(max_lines=1000))
+        self.assertEqual(
+            [len(batch.splitlines()) for batch in batches],
+            [1000, 1000, 500]
+        )
+        # The second batch holds points from both measurements
+        self.assertIn("First,", batches[1])
+        self.assertIn("Second ", batches[1])
+        self.assertEqual("\n".join(batches), self.batch.to_line_protocol())
+
+    def test_max_bytes(self):
+        batches = list(self.batch.iter_line_protocol(
+            max_lines=None,
+            max_bytes=4096
+        ))
+        for batch in batches:
+            self.assertLessEqual(len(batch.encode()), 4096)
+        self.assertEqual("\n".join(batches), self.batch.to_line_protocol())
+
+    def test_interleave(self):
+        lines = self.batch.to_line_protocol(interleave=True).splitlines()
+        timestamps = [int(line.rsplit(" ", 1)[1]) for line in lines]
+        self.assertEqual(len(lines), 2500)
+        self.assertEqual(timestamps, sorted(timestamps))
+        self.assertEqual(
+            sorted(lines),
+            sorted(self.batch.to_line_protocol().splitlines())
+        )
+        self.assertEqual(
+            "\n".join(self.batch.iter_line_protocol(
+                max_lines=700,
+                interleave=True
+            )),
+            "\n".join(lines)
+        )
+
+    def test_interleave_ties_keep_order(self):
+        time = np.zeros(2, dtype="datetime64[ns]")
+        batch = canal.Batch([
+            self.First(time=time, int_field=[1, 2]),
+            self.Second(time=time, float_field=[1.5, 2.5])
+        ])
+        self.assertEqual(
+            batch.to_line_protocol(interleave=True),
+            batch.to_line_protocol()
+        )
+
+    def test_precision(self):
+        lines = self.batch.to_line_protocol(precision="s").splitlines()
+        self.assertEqual(lines[1], "First,tag=a\\ tag int_field=1i 2")
+
+    def test_missing_required_field(self):
+        self.batch.add(self.Second(float_field=[None]))
+        with self.assertRaises(canal.MissingFieldError):
+            self.batch.to_line_protocol()
+
+    def test_empty(self):
+        self.assertEqual(canal.Batch().to_line_protocol(), "")
+        self.assertEqual(canal.Batch().to_line_protocol(interleave=True), "")
+        self.assertEqual(list(canal.Batch().iter_line_protocol()), [])
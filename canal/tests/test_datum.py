@@ -1,5 +1,7 @@
 import unittest
 
+import numpy as np
+
 from canal import (
     Tag,
     FloatField,
@@ -68,4 +70,42 @@ class FormatterTestCase(unittest.TestCase):
         self.assertEqual(
             Tag().format(12.3),
             '12.3'
-        )
\ No newline at end of file
+        )
+
+class FormatArrayTestCase(unittest.TestCase):
+    def assertFormatsLikeScalar(self, datum, values):
+        self.assertEqual(
+            list(datum.format_array(np.array(values))),
+            [datum.format(value) for value in values]
+        )
+
+    def test_format_array_float(self):
+        self.assertFormatsLikeScalar(FloatField(), [1.2, 1e16, 5e-324, np.nan])
+
+    def test_format_array_int(self):
+        self.assertFormatsLikeScalar(IntegerField(), [2, -3, 2**62])
+
+    def test_format_array_int_from_float(self):
+        self.assertFormatsLikeScalar(IntegerField(), [2.0, -3.7])
+
+    def test_format_array_int_nan(self):
+        with self.assertRaises(ValueError):
+            IntegerField().format_array(np.array([1.0, np.nan]))
+
+    def test_format_array_bool(self):
+        self.assertFormatsLikeScalar(BooleanField(), [True, False])
+
+    def test_format_array_string(self):
+        self.assertFormatsLikeScalar(
+            StringField(),
+            ['Hello world', 'say "hi"', '']
+        )
+
+    def test_format_array_tag(self):
+        self.assertFormatsLikeScalar(
+            Tag(),
+            ['Hello', 'Hello world', 'Hello,world', 'Hello=world']
+        )
+
+    def test_format_array_empty(self):
+        self.assertEqual(len(Tag().format_array(np.array([], dtype=object))), 0)
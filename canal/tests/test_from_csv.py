@@ -0,0 +1,134 @@
+import io
+
+import numpy as np
+
+import canal as canal
+
+from .util import NumpyTestCase
+
+
+class FromCSVTestCase(NumpyTestCase):
+    class Measurement(canal.Measurement):
+        int_field = canal.IntegerField()
+        alternate_db_name = canal.IntegerField(db_name="something_else")
+        float_field = canal.FloatField()
+        bool_field = canal.BooleanField()
+        string_field = canal.StringField()
+        tag_1 = canal.Tag()
+        tag_2 = canal.Tag()
+
+    CSV = (
+        "name,tags,time,int_field,something_else,float_field,bool_field,"
+        "string_field,tag_1,tag_2\n"
+        "Measurement,,1422568543702900257,1,2,1.2,true,some content,1,2\n"
+        'Measurement,,1422568543702900345,2,3,2.3,false,"a, b",1,2\n'
+    )
+
+    def test_from_csv(self):
+        for content in [
+            self.CSV,
+            self.CSV.encode(),
+            io.BytesIO(self.CSV.encode()),
+            io.StringIO(self.CSV)
+        ]:
+            test_series = self.Measurement.from_csv(content)
+
+            self.assertndArrayEqual(
+                test_series.time,
+                np.array(
+                    [
+                        "2015-01-29T21:55:43.702900257",
+                        "2015-01-29T21:55:43.702900345"
+                    ],
+                    dtype="datetime64[ns]"
+                )
+            )
+            self.assertndArrayEqual(test_series.int_field, np.array([1, 2]))
+            self.assertndArrayEqual(
+                test_series.alternate_db_name,
+                np.array([2, 3])
+            )
+            self.assertndArrayEqual(
+                test_series.float_field,
+                np.array([1.2, 2.3])
+            )
+            self.assertndArrayEqual(
+                test_series.bool_field,
+                np.array([True, False])
+            )
+            self.assertndArrayEqual(
+                test_series.string_field,
+                np.array(["some content", "a, b"], dtype=object)
+            )
+            self.assertndArrayEqual(
+                test_series.tag_1,
+                np.array(["1", "1"], dtype=object)
+            )
+
+            dtypes = test_series.data_frame.dtypes
+            self.assertEqual(dtypes["int_field"], np.int64)
+            self.assertEqual(dtypes["float_field"], np.float64)
+            self.assertEqual(dtypes["bool_field"], np.bool_)
+
+    def test_from_csv_group_by(self):
+        test_series = self.Measurement.from_csv(
+            "name,tags,time,int_field\n"
+            'Measurement,"tag_1=a,tag_2=x",1000,1\n'
+            'Measurement,"tag_1=a,tag_2=x",2000,2\n'
+            'Measurement,"tag_1=b,tag_2=",3000,3\n'
+            "Other,,3000,3\n"
+            "\n"
+            "name,tags,time,float_field\n"
+            "Measurement,tag_1=c,4000,4.5\n",
+            epoch="u"
+        )
+
+        self.assertndArrayEqual(
+            test_series.time,
+            np.array(
+                [1000000, 2000000, 3000000, 4000000],
+                dtype="datetime64[ns]"
+            )
+        )
+        self.assertEqual(list(test_series.tag_1), ["a", "a", "b", "c"])
+        self.assertEqual(list(test_series.tag_2), ["x", "x", None, None])
+        self.assertEqual(list(test_series.int_field[:3]), [1, 2, 3])
+        self.assertTrue(test_series.int_field.isna()[3])
+        self.assertEqual(list(test_series.float_field[3:]), [4.5])
+
+    def test_from_csv_missing_values(self):
+        test_series = self.Measurement.from_csv(
+            "name,tags,time,int_field,bool_field,string_field,float_field\n"
+            "Measurement,,1000,1,,,\n"
+            "Measurement,,2000,,true,a,1.5\n"
+        )
+
+        self.assertEqual(list(test_series.int_field.isna()), [False, True])
+        self.assertEqual(list(test_series.bool_field), [None, True])
+        self.assertEqual(list(test_series.string_field), [None, "a"])
+        self.assertTrue(np.isnan(test_series.float_field[0]))
+
+    def test_from_csv_null_tags(self):
+        test_series = self.Measurement.from_csv(
+            "name,tags,time,int_field,tag_1\n"
+            "Measurement,tag_2=,1000,1,\n"
+            "Measurement,tag_2=,2000,2,\n"
+        )
+        self.assertEqual(list(test_series.tag_1), [None, None])
+        self.assertEqual(list(test_series.tag_2), [None, None])
+
+    def test_from_csv_empty(self):
+        test_series = self.Measurement.from_csv(b"")
+        self.assertEqual(len(test_series), 0)
+
+    def test_from_csv_unrecognized_column(self):
+        with self.assertRaises(ValueError):
+            self.Measurement.from_csv("name,tags,time,unknown\nMeasurement,,1,1\n")
+
+    def test_from_csv_invalid(self):
+        with self.assertRaises(ValueError):
+            self.Measurement.from_csv("time,int_field\n1,1\n")
+
+    def test_from_csv_invalid_epoch(self):
+        with self.assertRaises(ValueError):
+            self.Measurement.from_csv(self.CSV, epoch="h")
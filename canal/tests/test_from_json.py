@@ -1,6 +1,12 @@
+import gc
+import io
+import json
+import unittest
+
 import numpy as np
 
 import canal as canal
+from canal import responses
 
 from .util import NumpyTestCase
 
@@ -128,3 +134,326 @@ class FromJSONTestCase(NumpyTestCase):
         )
         with self.assertRaises(ValueError):
             self.Measurement.from_json(test_json)
+
+    def test_from_json_epoch(self):
+        for epoch, timestamp, expected in [
+            ("ns", 1463500163012345678, "2016-05-17T15:49:23.012345678"),
+            ("u", 1463500163012345, "2016-05-17T15:49:23.012345"),
+            ("ms", 1463500163012, "2016-05-17T15:49:23.012"),
+            ("s", 1463500163, "2016-05-17T15:49:23")
+        ]:
+            test_series = self.Measurement.from_json(dict(
+                results=[dict(
+                    series=[dict(
+                        name="Measurement",
+                        columns=["time", "int_field"],
+                        values=[[timestamp, 1], [timestamp, 2]]
+                    )]
+                )]
+            ), epoch=epoch)
+
+            self.assertndArrayEqual(
+                test_series.time,
+                np.array(2*[expected], dtype="datetime64[ns]")
+            )
+            self.assertndArrayEqual(test_series.int_field, np.array([1, 2]))
+
+    def test_from_json_invalid_epoch(self):
+        with self.assertRaises(ValueError):
+            self.Measurement.from_json(dict(
+                name="Measurement",
+                columns=["time", "int_field"],
+                values=[[1, 1]]
+            ), epoch="h")
+
+    def test_from_json_dtypes(self):
+        test_series = self.Measurement.from_json(dict(
+            name="Measurement",
+            columns=[
+                "time",
+                "int_field",
+                "float_field",
+                "bool_field",
+                "string_field",
+                "tag_1"
+            ],
+            values=[
+                ["2015-01-29T21:55:43.702900257Z", 1, 1.5, True, "a", "x"],
+                ["2015-01-29T21:55:43.7029Z", 2, None, False, "b", "y"]
+            ]
+        ))
+
+        dtypes = test_series.data_frame.dtypes
+        self.assertEqual(dtypes["int_field"], np.int64)
+        self.assertEqual(dtypes["float_field"], np.float64)
+        self.assertEqual(dtypes["bool_field"], np.bool_)
+        self.assertTrue(np.isnan(test_series.float_field[1]))
+        self.assertndArrayEqual(
+            test_series.time,
+            np.array(
+                [
+                    "2015-01-29T21:55:43.702900257",
+                    "2015-01-29T21:55:43.702900000"
+                ],
+                dtype="datetime64[ns]"
+            )
+        )
+
+    def test_from_json_nulls(self):
+        test_series = self.Measurement.from_json(dict(
+            name="Measurement",
+            columns=["time", "int_field", "tag_1"],
+            values=[
+                ["2015-01-29T21:55:43Z", 1, None],
+                ["2015-01-29T21:55:44Z", None, "y"]
+            ]
+        ))
+
+        self.assertEqual(test_series.int_field.dtype, "Int64")
+        self.assertEqual(list(test_series.int_field.isna()), [False, True])
+        self.assertEqual(test_series.tag_1[0], None)
+
+    def test_from_json_null_tag_column(self):
+        test_series = self.Measurement.from_json(dict(
+            name="Measurement",
+            columns=["time", "int_field", "tag_1"],
+            values=[
+                ["2015-01-29T21:55:43Z", 1, None],
+                ["2015-01-29T21:55:44Z", 2, None]
+            ]
+        ))
+        self.assertEqual(list(test_series.tag_1), [None, None])
+
+    def test_from_json_group_by_empty_tag(self):
+        test_series = self.Measurement.from_json(dict(
+            name="Measurement",
+            tags=dict(tag_1=""),
+            columns=["time", "int_field"],
+            values=[["2015-01-29T21:55:43Z", 1]]
+        ))
+        self.assertEqual(list(test_series.tag_1), [None])
+
+    def test_from_json_no_values(self):
+        test_series = self.Measurement.from_json(dict(
+            name="Measurement",
+            columns=["time", "int_field"]
+        ))
+
+        self.assertEqual(len(test_series), 0)
+
+    def test_from_json_unrecognized_column(self):
+        with self.assertRaises(ValueError):
+            self.Measurement.from_json(dict(
+                name="Measurement",
+                columns=["time", "unknown"],
+                values=[["2015-01-29T21:55:43Z", 1]]
+            ))
+
+    def test_from_json_group_by(self):
+        test_series = self.Measurement.from_json(dict(results=[
+            dict(series=[
+                dict(
+                    name="Measurement",
+                    tags=dict(tag_1="a", tag_2=""),
+                    columns=["time", "int_field", "float_field"],
+                    values=[
+                        ["2015-01-29T21:55:43Z", 1, 1.5],
+                        ["2015-01-29T21:55:44Z", 2, 2.5]
+                    ]
+                ),
+                dict(
+                    name="SomeOtherMeasurement",
+                    columns=["time", "value"],
+                    values=[["2015-01-29T21:55:43Z", 1]]
+                ),
+                dict(
+                    name="Measurement",
+                    tags=dict(tag_1="b", tag_2="x"),
+                    columns=["time", "int_field"],
+                    values=[["2015-01-29T21:55:45Z", 3]]
+                )
+            ]),
+            dict(series=[
+                dict(
+                    name="Measurement",
+                    tags=dict(tag_1="c", tag_2="y"),
+                    columns=["time", "int_field", "float_field"],
+                    values=[["2015-01-29T21:55:46Z", 4, 4.5]]
+                )
+            ])
+        ]))
+
+        self.assertndArrayEqual(
+            test_series.time,
+            np.array(
+                [
+                    "2015-01-29T21:55:43",
+                    "2015-01-29T21:55:44",
+                    "2015-01-29T21:55:45",
+                    "2015-01-29T21:55:46"
+                ],
+                dtype="datetime64[ns]"
+            )
+        )
+        self.assertndArrayEqual(
+            test_series.tag_1,
+            np.array(["a", "a", "b", "c"], dtype=object)
+        )
+        self.assertEqual(list(test_series.tag_2), [None, None, "x", "y"])
+        self.assertEqual(
+            list(test_series.data_frame["tag_1"].cat.categories),
+            ["a", "b", "c"]
+        )
+        self.assertndArrayEqual(
+            test_series.int_field,
+            np.array([1, 2, 3, 4])
+        )
+        self.assertEqual(test_series.data_frame.dtypes["int_field"], np.int64)
+        self.assertndArrayEqual(
+            np.isnan(test_series.float_field),
+            np.array([False, False, True, False])
+        )
+
+    def test_from_json_group_by_unrecognized_tag(self):
+        with self.assertRaises(ValueError):
+            self.Measurement.from_json(dict(
+                name="Measurement",
+                tags=dict(unknown="a"),
+                columns=["time", "int_field"],
+                values=[["2015-01-29T21:55:43Z", 1]]
+            ))
+
+    def test_from_json_raw(self):
+        content = json.dumps(dict(results=[dict(series=[dict(
+            name="Measurement",
+            columns=["time", "int_field", "string_field"],
+            values=[["2015-01-29T21:55:43.702900257Z", 1, "é"]]
+        )])]), ensure_ascii=False)
+
+        for raw in [
+            content,
+            content.encode(),
+            bytearray(content.encode()),
+            io.StringIO(content),
+            io.BytesIO(content.encode())
+        ]:
+            test_series = self.Measurement.from_json(raw)
+            self.assertndArrayEqual(test_series.int_field, np.array([1]))
+            self.assertndArrayEqual(
+                test_series.string_field,
+                np.array(["é"], dtype=object)
+            )
+
+    def test_from_json_raw_invalid(self):
+        with self.assertRaises(ValueError):
+            self.Measurement.from_json(b'{"results": [')
+
+    def test_from_json_raw_error(self):
+        with self.assertRaises(ValueError):
+            self.Measurement.from_json(
+                b'{"results": [{"statement_id": 0, "error": "bad query"}]}'
+            )
+
+
+class JSONBackendTestCase(unittest.TestCase):
+    def test_json_backend(self):
+        self.assertIn(responses.json_backend(), responses.JSON_BACKENDS)
+        self.assertEqual(
+            responses.json_loads(b'{"a": [1, 2.5, "b", null]}'),
+            dict(a=[1, 2.5, "b", None])
+        )
+
+    def test_paused_gc(self):
+        self.assertTrue(gc.isenabled())
+        with responses.paused_gc():
+            self.assertFalse(gc.isenabled())
+        self.assertTrue(gc.isenabled())
+
+
+class FromJSONManyTestCase(NumpyTestCase):
+    class Measurement(canal.Measurement):
+        int_field = canal.IntegerField()
+        tag_1 = canal.Tag()
+
+    CONTENT = dict(results=[
+        dict(statement_id=0, series=[
+            dict(
+                name="Measurement",
+                tags=dict(tag_1="b"),
+                columns=["time", "int_field"],
+                values=[["2015-01-29T21:55:43Z", 1], ["2015-01-29T21:55:44Z", 2]]
+            ),
+            dict(
+                name="Measurement",
+                tags=dict(tag_1="a"),
+                columns=["time", "int_field"],
+                values=[["2015-01-29T21:55:45Z", 3]]
+            ),
+            dict(
+                name="Other",
+                columns=["time", "value"],
+                values=[["2015-01-29T21:55:45Z", 3]]
+            )
+        ]),
+        dict(statement_id=1),
+        dict(statement_id=2, series=[
+            dict(
+                name="Measurement",
+                columns=["time", "int_field", "tag_1"],
+                values=[["2015-01-29T21:55:46Z", 4, "c"]]
+            )
+        ])
+    ])
+
+    def assertExpected(self, measurements):
+        self.assertEqual(
+            list(measurements),
+            [(0, (("tag_1", "b"),)), (0, (("tag_1", "a"),)), (2, ())]
+        )
+        first, second, third = measurements.values()
+        self.assertndArrayEqual(first.int_field, np.array([1, 2]))
+        self.assertEqual(list(first.tag_1), ["b", "b"])
+        self.assertndArrayEqual(
+            second.time,
+            np.array(["2015-01-29T21:55:45"], dtype="datetime64[ns]")
+        )
+        self.assertEqual(list(second.tag_1), ["a"])
+        self.assertEqual(list(third.tag_1), ["c"])
+
+    def test_from_json_many(self):
+        self.assertExpected(self.Measurement.from_json_many(self.CONTENT))
+
+    def test_from_json_many_raw(self):
+        self.assertExpected(
+            self.Measurement.from_json_many(json.dumps(self.CONTENT))
+        )
+
+    def test_from_json_many_threads(self):
+        self.assertExpected(
+            self.Measurement.from_json_many(self.CONTENT, workers=2)
+        )
+
+    def test_from_json_many_processes(self):
+        self.assertExpected(self.Measurement.from_json_many(
+            self.CONTENT,
+            workers=2,
+            processes=True
+        ))
+
+    def test_from_json_many_empty_tag(self):
+        measurements = self.Measurement.from_json_many(dict(results=[
+            dict(statement_id=0, series=[dict(
+                name="Measurement",
+                tags=dict(tag_1=""),
+                columns=["time", "int_field"],
+                values=[["2015-01-29T21:55:43Z", 1]]
+            )])
+        ]))
+        self.assertEqual(list(measurements), [(0, (("tag_1", None),))])
+        self.assertEqual(list(measurements[0, (("tag_1", None),)].tag_1), [None])
+
+    def test_from_json_many_empty(self):
+        self.assertEqual(
+            len(self.Measurement.from_json_many(dict(results=[]))),
+            0
+        )
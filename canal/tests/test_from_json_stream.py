@@ -0,0 +1,193 @@
+import http.server
+import io
+import json
+import threading
+import urllib.request
+
+import numpy as np
+
+import canal as canal
+
+from .util import NumpyTestCase
+
+
+def make_chunk(name, values, **series):
+    return json.dumps(dict(results=[dict(
+        statement_id=0,
+        series=[dict(
+            name=name,
+            columns=["time", "int_field", "string_field", "tag_1"],
+            values=values,
+            **series
+        )],
+        partial=True
+    )]), ensure_ascii=False) + "\n"
+
+
+class ChunkedHandler(http.server.BaseHTTPRequestHandler):
+    """
+    Serves the server's `chunks` using chunked transfer encoding, with the
+    HTTP chunks split at the server's `boundaries` rather than at the JSON
+    document boundaries
+    """
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = "".join(self.server.chunks).encode()
+        boundaries = [0] + self.server.boundaries + [len(body)]
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for start, end in zip(boundaries[:-1], boundaries[1:]):
+            if end > start:
+                self.wfile.write(b"%x\r\n" % (end - start))
+                self.wfile.write(body[start:end] + b"\r\n")
+                self.wfile.flush()
+        self.wfile.write(b"0\r\n\r\n")
+
+    def log_message(self, *args):
+        pass
+
+
+class FromJSONStreamTestCase(NumpyTestCase):
+    class Measurement(canal.Measurement):
+        int_field = canal.IntegerField()
+        string_field = canal.StringField()
+        tag_1 = canal.Tag()
+
+    chunks = [
+        make_chunk("Measurement", [
+            ["2015-01-29T21:55:43.702900257Z", 1, "café", "a"],
+            ["2015-01-29T21:55:44Z", 2, "b", "a"]
+        ]),
+        make_chunk("Other", [["2015-01-29T21:55:45Z", 3, "c", "a"]]),
+        make_chunk("Measurement", [
+            ["2015-01-29T21:55:46.5Z", 4, "d", "b"]
+        ])
+    ]
+
+    def setUp(self):
+        self.server = http.server.HTTPServer(("127.0.0.1", 0), ChunkedHandler)
+        self.server.chunks = self.chunks
+        self.server.boundaries = []
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+
+    def fetch(self):
+        return urllib.request.urlopen(
+            "http://127.0.0.1:{}/query".format(self.server.server_port)
+        )
+
+    def assertExpected(self, measurements):
+        self.assertEqual([len(m) for m in measurements], [2, 1])
+        self.assertndArrayEqual(
+            measurements[0].time,
+            np.array(
+                [
+                    "2015-01-29T21:55:43.702900257",
+                    "2015-01-29T21:55:44"
+                ],
+                dtype="datetime64[ns]"
+            )
+        )
+        self.assertndArrayEqual(measurements[0].int_field, np.array([1, 2]))
+        self.assertndArrayEqual(
+            measurements[0].string_field,
+            np.array(["café", "b"], dtype=object)
+        )
+        self.assertndArrayEqual(measurements[1].int_field, np.array([4]))
+        self.assertndArrayEqual(measurements[1].tag_1, np.array(["b"]))
+
+    def test_whole_documents(self):
+        body = "".join(self.chunks).encode()
+        self.server.boundaries = [
+            body.index(b"\n", start) + 1
+            for start in [0, len(self.chunks[0]) + 1]
+        ]
+        with self.fetch() as response:
+            self.assertExpected(
+                list(self.Measurement.iter_from_json_stream(response))
+            )
+
+    def test_partial_chunks(self):
+        body = "".join(self.chunks).encode()
+        for size in [1, 7, 64]:
+            self.server.boundaries = list(range(size, len(body), size))
+            with self.fetch() as response:
+                self.assertExpected(
+                    list(self.Measurement.iter_from_json_stream(response))
+                )
+
+    def test_split_multibyte_character(self):
+        body = "".join(self.chunks).encode()
+        split = body.index("é".encode()) + 1
+        self.server.boundaries = [split]
+        with self.fetch() as response:
+            self.assertExpected(
+                list(self.Measurement.iter_from_json_stream(response))
+            )
+
+    def test_streams_lazily(self):
+        self.server.boundaries = [len(self.chunks[0].encode())]
+        with self.fetch() as response:
+            measurements = self.Measurement.iter_from_json_stream(response)
+            self.assertEqual(len(next(measurements)), 2)
+            self.assertEqual(len(next(measurements)), 1)
+            with self.assertRaises(StopIteration):
+                next(measurements)
+
+
+class JSONStreamSourcesTestCase(NumpyTestCase):
+    class Measurement(canal.Measurement):
+        int_field = canal.IntegerField()
+        string_field = canal.StringField()
+        tag_1 = canal.Tag()
+
+    content = FromJSONStreamTestCase.chunks
+
+    def test_sources(self):
+        text = "".join(self.content)
+        for source in [
+            text,
+            text.encode(),
+            io.StringIO(text),
+            io.BytesIO(text.encode()),
+            [text[:10], text[10:100], text[100:]],
+            # Without a trailing newline
+            text.rstrip("\n")
+        ]:
+            measurements = list(self.Measurement.iter_from_json_stream(source))
+            self.assertEqual([len(m) for m in measurements], [2, 1])
+
+    def test_epoch(self):
+        content = json.dumps(dict(results=[dict(series=[dict(
+            name="Measurement",
+            columns=["time", "int_field"],
+            values=[[1463500163012, 1]]
+        )])]))
+        measurement, = self.Measurement.iter_from_json_stream(
+            content,
+            epoch="ms"
+        )
+        self.assertEqual(
+            measurement.time[0],
+            np.datetime64("2016-05-17T15:49:23.012", "ns")
+        )
+
+    def test_invalid_epoch(self):
+        with self.assertRaises(ValueError):
+            self.Measurement.iter_from_json_stream("", epoch="h")
+
+    def test_error(self):
+        content = json.dumps(dict(results=[dict(
+            statement_id=0,
+            error="database not found: db"
+        )]))
+        with self.assertRaises(ValueError):
+            list(self.Measurement.iter_from_json_stream(content))
@@ -0,0 +1,187 @@
+import io
+
+import numpy as np
+
+import canal as canal
+
+from .util import NumpyTestCase
+
+
+class FromLineProtocolTestCase(NumpyTestCase):
+    class Measurement(canal.Measurement):
+        int_field = canal.IntegerField()
+        alternate_db_name = canal.IntegerField(db_name="something else")
+        float_field = canal.FloatField()
+        bool_field = canal.BooleanField()
+        string_field = canal.StringField()
+        tag_1 = canal.Tag()
+        tag_2 = canal.Tag(db_name="tag,2")
+
+    NUM_SAMPLES = 10
+
+    def setUp(self):
+        self.test_series = self.Measurement(
+            time=np.arange(self.NUM_SAMPLES).astype("datetime64[ms]"),
+            int_field=np.arange(self.NUM_SAMPLES),
+            alternate_db_name=-np.arange(self.NUM_SAMPLES),
+            float_field=np.arange(self.NUM_SAMPLES) / 3,
+            bool_field=np.arange(self.NUM_SAMPLES) % 2 == 0,
+            string_field=self.NUM_SAMPLES * ['some "quoted", content'],
+            tag_1=self.NUM_SAMPLES * ["a tag=with, escapes"],
+            tag_2=np.arange(self.NUM_SAMPLES) % 3
+        )
+
+    def assertMeasurementEqual(self, measurement, expected):
+        self.assertndArrayEqual(measurement.time, expected.time)
+        for name in self.Measurement.tags_and_fields:
+            self.assertEqual(
+                list(getattr(measurement, name)),
+                list(getattr(expected, name)),
+                name
+            )
+
+    def test_round_trip(self):
+        test_series = self.Measurement.from_line_protocol(
+            self.test_series.to_line_protocol()
+        )
+        self.assertEqual(test_series.int_field.dtype, np.int64)
+        self.assertEqual(test_series.float_field.dtype, np.float64)
+        self.assertEqual(test_series.bool_field.dtype, np.bool_)
+        self.assertndArrayEqual(
+            test_series.tag_2,
+            (np.arange(self.NUM_SAMPLES) % 3).astype(str)
+        )
+        test_series.tag_2 = self.test_series.tag_2
+        self.assertMeasurementEqual(test_series, self.test_series)
+
+    def test_without_escaping(self):
+        test_series = self.Measurement.from_line_protocol(
+            "Measurement,tag_1=a int_field=1i,float_field=1.5 10\n"
+            "Measurement,tag_1=b int_field=2i,float_field=2.5 20\n"
+        )
+        self.assertndArrayEqual(
+            test_series.time,
+            np.array([10, 20], dtype="datetime64[ns]")
+        )
+        self.assertndArrayEqual(test_series.int_field, np.array([1, 2]))
+        self.assertndArrayEqual(test_series.float_field, np.array([1.5, 2.5]))
+        self.assertndArrayEqual(
+            test_series.tag_1,
+            np.array(["a", "b"], dtype=object)
+        )
+
+    def test_escaping(self):
+        test_series = self.Measurement.from_line_protocol(
+            'Measurement,tag\\,2=a\\ b\\=c\\,d '
+            'string_field="say \\"hi\\", a\\\\b",something\\ else=1i 10'
+        )
+        self.assertEqual(list(test_series.tag_2), ["a b=c,d"])
+        self.assertEqual(list(test_series.string_field), ['say "hi", a\\b'])
+        self.assertEqual(list(test_series.alternate_db_name), [1])
+
+    def test_boolean_values(self):
+        test_series = self.Measurement.from_line_protocol("\n".join(
+            "Measurement bool_field={}".format(value)
+            for value in ["t", "T", "true", "True", "TRUE",
+                          "f", "F", "false", "False", "FALSE"]
+        ))
+        self.assertEqual(list(test_series.bool_field), 5*[True] + 5*[False])
+
+    def test_missing_values(self):
+        test_series = self.Measurement.from_line_protocol(
+            "Measurement,tag_1=a int_field=1i 10\n"
+            "Measurement float_field=2.5 20\n"
+        )
+        self.assertEqual(list(test_series.int_field.isna()), [False, True])
+        self.assertTrue(np.isnan(test_series.float_field[0]))
+        self.assertEqual(test_series.float_field[1], 2.5)
+        self.assertEqual(list(test_series.tag_1), ["a", None])
+        self.assertEqual(list(test_series.bool_field), [None, None])
+
+    def test_missing_timestamps(self):
+        test_series = self.Measurement.from_line_protocol(
+            "Measurement int_field=1i\n"
+            "Measurement int_field=2i\n"
+        )
+        [self.assertIsNone(time) for time in test_series.time]
+
+    def test_some_missing_timestamps(self):
+        line_protocol = (
+            "Measurement,tag_1=x int_field=1i 10\n"
+            "Measurement,tag_1=y int_field=2i\n"
+            "Measurement,tag_1=z int_field=3i 30"
+        )
+        test_series = self.Measurement.from_line_protocol(line_protocol)
+        self.assertTrue(np.isnat(test_series.time[1]))
+        self.assertEqual(test_series.to_line_protocol(), line_protocol)
+
+    def test_skips_comments_and_other_measurements(self):
+        test_series = self.Measurement.from_line_protocol(
+            "# a comment\n"
+            "\n"
+            "Other int_field=1i 10\n"
+            "Measurement int_field=2i 20\n"
+        )
+        self.assertEqual(list(test_series.int_field), [2])
+
+    def test_precision(self):
+        test_series = self.Measurement.from_line_protocol(
+            "Measurement int_field=1i 1463500163",
+            precision="s"
+        )
+        self.assertndArrayEqual(
+            test_series.time,
+            np.array(["2016-05-17T15:49:23"], dtype="datetime64[ns]")
+        )
+
+    def test_bytes_and_files(self):
+        line_protocol = self.test_series.to_line_protocol()
+        for content in [
+            line_protocol.encode(),
+            bytearray(line_protocol.encode()),
+            io.BytesIO(line_protocol.encode()),
+            io.StringIO(line_protocol)
+        ]:
+            self.assertMeasurementEqual(
+                self.Measurement.from_line_protocol(content),
+                self.Measurement.from_line_protocol(line_protocol)
+            )
+
+    def test_chunks(self):
+        line_protocol = (
+            "Measurement,tag_1=ü int_field=1i 10\n"
+            "Measurement,tag_1=é int_field=2i 20\n"
+        ).encode()
+        # Split every few bytes, including within multi-byte characters
+        chunks = [line_protocol[i:i + 3] for i in range(0, len(line_protocol), 3)]
+        test_series = self.Measurement.from_line_protocol(iter(chunks))
+        self.assertEqual(list(test_series.tag_1), ["ü", "é"])
+        self.assertEqual(list(test_series.int_field), [1, 2])
+
+    def test_iter_from_line_protocol(self):
+        blocks = list(self.Measurement.iter_from_line_protocol(
+            self.test_series.to_line_protocol(),
+            max_lines=4
+        ))
+        self.assertEqual([len(block) for block in blocks], [4, 4, 2])
+        self.assertEqual(
+            [value for block in blocks for value in block.int_field],
+            list(self.test_series.int_field)
+        )
+
+    def test_empty(self):
+        self.assertEqual(len(self.Measurement.from_line_protocol("")), 0)
+
+    def test_unrecognized_key(self):
+        with self.assertRaises(ValueError):
+            self.Measurement.from_line_protocol("Measurement unknown=1i 10")
+        with self.assertRaises(ValueError):
+            self.Measurement.from_line_protocol(
+                "Measurement,unknown=a int_field=1i 10"
+            )
+
+    def test_malformed_line(self):
+        with self.assertRaises(ValueError):
+            self.Measurement.from_line_protocol("Measurement int_field 10")
+        with self.assertRaises(ValueError):
+            self.Measurement.from_line_protocol("Measurement int_field=1 10")
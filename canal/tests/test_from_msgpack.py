@@ -0,0 +1,135 @@
+import io
+import struct
+import unittest
+
+import numpy as np
+
+import canal as canal
+
+from .util import NumpyTestCase
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+def influx_time(seconds, nanoseconds):
+    return msgpack.ExtType(5, struct.pack(">qI", seconds, nanoseconds))
+
+
+@unittest.skipIf(msgpack is None, "msgpack is not installed")
+class FromMsgpackTestCase(NumpyTestCase):
+    class Measurement(canal.Measurement):
+        int_field = canal.IntegerField()
+        alternate_db_name = canal.IntegerField(db_name="something_else")
+        float_field = canal.FloatField()
+        bool_field = canal.BooleanField()
+        string_field = canal.StringField()
+        tag_1 = canal.Tag()
+
+    def pack(self, values, columns=None, **series):
+        return msgpack.packb(dict(results=[dict(
+            statement_id=0,
+            series=[dict(
+                name="Measurement",
+                columns=columns or [
+                    "time",
+                    "int_field",
+                    "something_else",
+                    "float_field",
+                    "bool_field",
+                    "string_field",
+                    "tag_1"
+                ],
+                values=values,
+                **series
+            )]
+        )]), use_bin_type=True)
+
+    def test_from_msgpack(self):
+        content = self.pack([
+            [influx_time(1422568543, 702900257), 1, 2, 1.2, True, "a", "x"],
+            [influx_time(1422568543, 702900345), 2, 3, 2.3, False, "b", "x"]
+        ])
+
+        for source in [content, io.BytesIO(content), [content[:7], content[7:]]]:
+            test_series = self.Measurement.from_msgpack(source)
+
+            self.assertndArrayEqual(
+                test_series.time,
+                np.array(
+                    [
+                        "2015-01-29T21:55:43.702900257",
+                        "2015-01-29T21:55:43.702900345"
+                    ],
+                    dtype="datetime64[ns]"
+                )
+            )
+            self.assertndArrayEqual(test_series.int_field, np.array([1, 2]))
+            self.assertndArrayEqual(
+                test_series.alternate_db_name,
+                np.array([2, 3])
+            )
+            self.assertndArrayEqual(
+                test_series.bool_field,
+                np.array([True, False])
+            )
+            self.assertndArrayEqual(
+                test_series.string_field,
+                np.array(["a", "b"], dtype=object)
+            )
+            dtypes = test_series.data_frame.dtypes
+            self.assertEqual(dtypes["int_field"], np.int64)
+            self.assertEqual(dtypes["float_field"], np.float64)
+
+    def test_from_msgpack_epoch(self):
+        test_series = self.Measurement.from_msgpack(
+            self.pack([[1422568543702, 1]], columns=["time", "int_field"]),
+            epoch="ms"
+        )
+        self.assertndArrayEqual(
+            test_series.time,
+            np.array(["2015-01-29T21:55:43.702"], dtype="datetime64[ns]")
+        )
+
+    def test_from_msgpack_timestamp_extension(self):
+        # Pack a placeholder 8 byte extension, then give it the reserved
+        # timestamp type, which older msgpack versions can't pack directly
+        timestamp = msgpack.ExtType(
+            6,
+            struct.pack(">Q", 702900257 << 34 | 1422568543)
+        )
+        content = self.pack([[timestamp, 1]], columns=["time", "int_field"])
+        test_series = self.Measurement.from_msgpack(
+            content.replace(b"\xd7\x06", b"\xd7\xff")
+        )
+        self.assertndArrayEqual(
+            test_series.time,
+            np.array(["2015-01-29T21:55:43.702900257"], dtype="datetime64[ns]")
+        )
+
+    def test_from_msgpack_group_by(self):
+        content = self.pack(
+            [[influx_time(1, 0), 1], [influx_time(2, 0), 2]],
+            columns=["time", "int_field"],
+            tags=dict(tag_1="a")
+        ) + self.pack(
+            [[influx_time(3, 0), 3]],
+            columns=["time", "int_field"],
+            tags=dict(tag_1="b")
+        )
+        test_series = self.Measurement.from_msgpack(content)
+        self.assertndArrayEqual(test_series.int_field, np.array([1, 2, 3]))
+        self.assertEqual(list(test_series.tag_1), ["a", "a", "b"])
+
+    def test_from_msgpack_no_series(self):
+        with self.assertRaises(ValueError):
+            self.Measurement.from_msgpack(msgpack.packb(dict(results=[])))
+
+    def test_from_msgpack_error(self):
+        with self.assertRaises(ValueError):
+            self.Measurement.from_msgpack(msgpack.packb(dict(results=[dict(
+                statement_id=0,
+                error="database not found: db"
+            )]), use_bin_type=True))
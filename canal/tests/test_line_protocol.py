@@ -1,7 +1,13 @@
 import collections
 import copy
 import datetime
+import gzip
+import io
 import re
+import socket
+import tempfile
+import threading
+import unittest
 
 import numpy as np
 import pytz
@@ -201,6 +207,7 @@ class LineProtocolTestCase(NumpyTestCase, LineProtocolMixin):
             self.assertNotIn(missing_field, components["fields"])
 
     def test_nan_column(self):
+        # InfluxDB can't store NaN, so NaN floats are skipped, as are nulls
         fields = copy.deepcopy(self.FIELDS)
         fields[1] = _Datum(
             "float_field",
@@ -222,8 +229,9 @@ class LineProtocolTestCase(NumpyTestCase, LineProtocolMixin):
             self.assertEqual(components["tags"], {
                 tag.db_name: tag.data for tag in self.TAGS
             })
-            np.testing.assert_equal(components["fields"], {
+            self.assertEqual(components["fields"], {
                 field.db_name: field.data[i] for field in fields
+                if not (field.data.dtype.kind == "f" and np.isnan(field.data[i]))
             })
             self.assertEqual(components["timestamp"], self.TIME[i])
 
@@ -251,8 +259,9 @@ class LineProtocolTestCase(NumpyTestCase, LineProtocolMixin):
             self.assertEqual(components["tags"], {
                 tag.db_name: tag.data for tag in self.TAGS
             })
-            np.testing.assert_equal(components["fields"], {
+            self.assertEqual(components["fields"], {
                 field.db_name: field.data[i] for field in fields
+                if not (field.data.dtype.kind == "f" and np.isnan(field.data[i]))
             })
             self.assertEqual(components["timestamp"], self.TIME[i])
 
@@ -350,3 +359,366 @@ class LineProtocolTestCase(NumpyTestCase, LineProtocolMixin):
             })
             self.assertNotIn(missing_tag, components["tags"])
             self.assertEqual(components["timestamp"], self.TIME[i])
+
+    def test_row_without_fields(self):
+        class ArrayMeasurement(self.TestMeasurement):
+            BACKEND = "numpy"
+
+        for measurement_class in (self.TestMeasurement, ArrayMeasurement):
+            test_series = measurement_class(
+                int_field=[1, None, 3],
+                float_field=[1.5, np.nan, 3.5],
+                string_field=["a", None, "c"],
+                first_tag="a"
+            )
+            with self.assertRaises(canal.MissingFieldError):
+                test_series.to_line_protocol()
+            with self.assertRaises(canal.MissingFieldError):
+                list(test_series.iter_line_protocol())
+            with self.assertRaises(canal.MissingFieldError):
+                canal.Batch([test_series]).to_line_protocol()
+
+
+class IterLineProtocolTestCase(unittest.TestCase):
+    class TestMeasurement(canal.Measurement):
+        int_field = canal.IntegerField()
+        string_field = canal.StringField()
+        tag = canal.Tag()
+
+    NUM_SAMPLES = 1000
+
+    def setUp(self):
+        self.test_series = self.TestMeasurement(
+            time=np.arange(self.NUM_SAMPLES).astype("datetime64[s]"),
+            int_field=np.arange(self.NUM_SAMPLES),
+            string_field=[
+                "x" * (i % 17) + "é" * (i % 5)
+                for i in range(self.NUM_SAMPLES)
+            ],
+            tag="some tag"
+        )
+
+    def test_batches_reassemble(self):
+        batches = list(self.test_series.iter_line_protocol(max_lines=300))
+        self.assertEqual(
+            "\n".join(batches),
+            self.test_series.to_line_protocol()
+        )
+
+    def test_max_lines(self):
+        batches = list(self.test_series.iter_line_protocol(max_lines=300))
+        self.assertEqual(
+            [len(batch.splitlines()) for batch in batches],
+            [300, 300, 300, 100]
+        )
+
+    def test_max_bytes(self):
+        max_bytes = 1000
+        batches = list(self.test_series.iter_line_protocol(
+            max_lines=None,
+            max_bytes=max_bytes
+        ))
+        self.assertEqual(
+            "\n".join(batches),
+            self.test_series.to_line_protocol()
+        )
+        for batch, next_batch in zip(batches, batches[1:]):
+            size = len(batch.encode())
+            self.assertLessEqual(size, max_bytes)
+            # Each batch is filled as far as the next line allows
+            next_line = next_batch.splitlines()[0]
+            self.assertGreater(size + 1 + len(next_line.encode()), max_bytes)
+
+    def test_max_lines_and_max_bytes(self):
+        batches = list(self.test_series.iter_line_protocol(
+            max_lines=20,
+            max_bytes=2000
+        ))
+        self.assertEqual(
+            "\n".join(batches),
+            self.test_series.to_line_protocol()
+        )
+        for batch in batches:
+            self.assertLessEqual(len(batch.splitlines()), 20)
+            self.assertLessEqual(len(batch.encode()), 2000)
+
+    def test_line_larger_than_max_bytes(self):
+        batches = list(self.test_series.iter_line_protocol(max_bytes=10))
+        self.assertEqual(len(batches), self.NUM_SAMPLES)
+
+    def test_empty(self):
+        test_series = self.TestMeasurement(int_field=[])
+        self.assertEqual(list(test_series.iter_line_protocol()), [])
+
+    def test_invalid_limits(self):
+        with self.assertRaises(ValueError):
+            self.test_series.iter_line_protocol(max_lines=0)
+        with self.assertRaises(ValueError):
+            self.test_series.iter_line_protocol(max_bytes=-1)
+
+
+class WriteLineProtocolTestCase(unittest.TestCase):
+    class TestMeasurement(canal.Measurement):
+        int_field = canal.IntegerField()
+        string_field = canal.StringField()
+        tag = canal.Tag()
+
+    NUM_SAMPLES = 12000
+
+    def setUp(self):
+        self.test_series = self.TestMeasurement(
+            time=np.arange(self.NUM_SAMPLES).astype("datetime64[s]"),
+            int_field=np.arange(self.NUM_SAMPLES),
+            string_field="ünicode",
+            tag="some tag"
+        )
+        self.expected = self.test_series.to_line_protocol().encode()
+
+    def test_write_bytes_io(self):
+        buffer = io.BytesIO()
+        num_bytes = self.test_series.write_line_protocol(buffer)
+        self.assertEqual(buffer.getvalue(), self.expected)
+        self.assertEqual(num_bytes, len(self.expected))
+
+    def test_write_bytearray(self):
+        buffer = bytearray(b"prefix")
+        self.test_series.write_line_protocol(buffer)
+        self.assertEqual(bytes(buffer), b"prefix" + self.expected)
+
+    def test_write_file(self):
+        with tempfile.TemporaryFile() as fp:
+            self.test_series.write_line_protocol(fp)
+            fp.seek(0)
+            self.assertEqual(fp.read(), self.expected)
+
+    def test_write_socket(self):
+        sender, receiver = socket.socketpair()
+        received = bytearray()
+        reader = threading.Thread(
+            target=lambda: received.extend(b"".join(iter(
+                lambda: receiver.recv(65536), b""
+            )))
+        )
+        reader.start()
+        with sender:
+            self.test_series.write_line_protocol(sender)
+        reader.join()
+        receiver.close()
+        self.assertEqual(bytes(received), self.expected)
+
+    def test_to_line_protocol_bytes(self):
+        self.assertEqual(
+            self.test_series.to_line_protocol_bytes(),
+            self.expected
+        )
+
+    def test_empty(self):
+        test_series = self.TestMeasurement(int_field=[])
+        self.assertEqual(test_series.to_line_protocol_bytes(), b"")
+
+
+class GzipLineProtocolTestCase(unittest.TestCase):
+    class TestMeasurement(canal.Measurement):
+        int_field = canal.IntegerField()
+        tag = canal.Tag()
+
+    NUM_SAMPLES = 12000
+
+    def setUp(self):
+        self.test_series = self.TestMeasurement(
+            time=np.arange(self.NUM_SAMPLES).astype("datetime64[s]"),
+            int_field=np.arange(self.NUM_SAMPLES),
+            tag="some tag"
+        )
+        self.expected = self.test_series.to_line_protocol().encode()
+
+    def test_to_line_protocol_gzip(self):
+        self.assertEqual(
+            gzip.decompress(self.test_series.to_line_protocol_gzip()),
+            self.expected
+        )
+
+    def test_compresslevel(self):
+        self.assertLess(
+            len(self.test_series.to_line_protocol_gzip(compresslevel=9)),
+            len(self.test_series.to_line_protocol_gzip(compresslevel=0))
+        )
+
+    def test_batches_are_gzip_members(self):
+        members = list(self.test_series.iter_line_protocol_gzip(
+            max_lines=5000
+        ))
+        self.assertEqual(len(members), 3)
+        self.assertEqual(
+            b"\n".join(gzip.decompress(member) for member in members),
+            self.expected
+        )
+
+    def test_gzip_writer(self):
+        buffer = bytearray()
+        with canal.line_protocol.GzipWriter(buffer) as writer:
+            writer.write(b"some ")
+            writer.write(b"bytes")
+        self.assertEqual(gzip.decompress(bytes(buffer)), b"some bytes")
+
+
+class SerializerTestCase(unittest.TestCase):
+    class TestMeasurement(canal.Measurement):
+        int_field = canal.IntegerField(db_name="an int")
+        tag = canal.Tag(db_name="a,tag=key")
+
+    def test_keys_are_escaped(self):
+        test_series = self.TestMeasurement(
+            time=np.array([1], dtype="datetime64[ns]"),
+            int_field=[1],
+            tag="value"
+        )
+        self.assertEqual(
+            test_series.to_line_protocol(),
+            "TestMeasurement,a\\,tag\\=key=value an\\ int=1i 1"
+        )
+
+    def test_serializer_per_subclass(self):
+        class Subclass(self.TestMeasurement):
+            float_field = canal.FloatField()
+
+        test_series = Subclass(
+            time=np.array([1], dtype="datetime64[ns]"),
+            int_field=[1],
+            float_field=[1.5],
+            tag="value"
+        )
+        self.assertEqual(
+            test_series.to_line_protocol(),
+            "Subclass,a\\,tag\\=key=value float_field=1.5,an\\ int=1i 1"
+        )
+        self.assertIsNot(
+            Subclass._serializer,
+            self.TestMeasurement._serializer
+        )
+
+
+class SeriesKeyTestCase(unittest.TestCase):
+    class TestMeasurement(canal.Measurement):
+        int_field = canal.IntegerField()
+        first_tag = canal.Tag()
+        second_tag = canal.Tag()
+
+    NUM_SAMPLES = 1000
+
+    def test_series_keys(self):
+        first_tags = np.array(["a b", "c,d", None], dtype=object)[
+            np.arange(self.NUM_SAMPLES) % 3
+        ]
+        second_tags = np.array([1.5, np.nan])[np.arange(self.NUM_SAMPLES) % 2]
+        test_series = self.TestMeasurement(
+            time=np.arange(self.NUM_SAMPLES).astype("datetime64[ns]"),
+            int_field=np.arange(self.NUM_SAMPLES),
+            first_tag=first_tags,
+            second_tag=second_tags
+        )
+
+        expected = []
+        for i, (first_tag, second_tag) in enumerate(zip(first_tags, second_tags)):
+            series_key = ["TestMeasurement"]
+            if first_tag is not None:
+                series_key.append("first_tag=" + canal.Tag().format(first_tag))
+            series_key.append("second_tag=" + canal.Tag().format(second_tag))
+            expected.append("{} int_field={}i {}".format(",".join(series_key), i, i))
+
+        self.assertEqual(test_series.to_line_protocol(), "\n".join(expected))
+
+    def test_group_rows(self):
+        groups, representatives = canal.line_protocol.group_rows([
+            np.array(["a", "b", "a", "a", None], dtype=object),
+            np.array([1, 2, 1, 2, 1])
+        ], 5)
+        self.assertEqual(list(groups), [0, 1, 0, 2, 3])
+        self.assertEqual(len(representatives), 4)
+        self.assertEqual(list(groups[representatives]), [0, 1, 2, 3])
+
+
+class ParallelLineProtocolTestCase(unittest.TestCase):
+    class TestMeasurement(canal.Measurement):
+        int_field = canal.IntegerField()
+        string_field = canal.StringField()
+        tag = canal.Tag()
+
+    NUM_SAMPLES = 12345
+
+    def setUp(self):
+        self.test_series = self.TestMeasurement(
+            time=np.arange(self.NUM_SAMPLES).astype("datetime64[s]"),
+            int_field=np.arange(self.NUM_SAMPLES),
+            string_field=np.array(["a", None, "c"], dtype=object)[
+                np.arange(self.NUM_SAMPLES) % 3
+            ],
+            tag=(np.arange(self.NUM_SAMPLES) % 7).astype(str)
+        )
+
+    def test_to_line_protocol_workers(self):
+        self.assertEqual(
+            self.test_series.to_line_protocol(workers=2),
+            self.test_series.to_line_protocol()
+        )
+
+    def test_iter_line_protocol_workers(self):
+        self.assertEqual(
+            list(self.test_series.iter_line_protocol(
+                max_lines=1000,
+                max_bytes=20000,
+                workers=2
+            )),
+            list(self.test_series.iter_line_protocol(
+                max_lines=1000,
+                max_bytes=20000
+            ))
+        )
+
+    def test_empty(self):
+        test_series = self.TestMeasurement(int_field=[])
+        self.assertEqual(test_series.to_line_protocol(workers=2), "")
+
+    def test_invalid_workers(self):
+        with self.assertRaises(ValueError):
+            self.test_series.iter_line_protocol(workers=0)
+
+
+class PrecisionTestCase(unittest.TestCase):
+    class TestMeasurement(canal.Measurement):
+        int_field = canal.IntegerField()
+
+    def setUp(self):
+        self.test_series = self.TestMeasurement(
+            time=np.array(
+                ["2016-05-17T15:49:23.012345678Z"],
+                dtype="datetime64[ns]"
+            ),
+            int_field=[1]
+        )
+
+    def test_precisions(self):
+        for precision, timestamp in [
+            ("ns", "1463500163012345678"),
+            ("u", "1463500163012345"),
+            ("ms", "1463500163012"),
+            ("s", "1463500163")
+        ]:
+            self.assertEqual(
+                self.test_series.to_line_protocol(precision=precision),
+                "TestMeasurement int_field=1i " + timestamp
+            )
+            self.assertEqual(
+                list(self.test_series.iter_line_protocol(precision=precision)),
+                ["TestMeasurement int_field=1i " + timestamp]
+            )
+            self.assertEqual(
+                self.test_series.to_line_protocol_bytes(precision=precision),
+                b"TestMeasurement int_field=1i " + timestamp.encode()
+            )
+
+    def test_invalid_precision(self):
+        with self.assertRaises(ValueError):
+            self.test_series.to_line_protocol(precision="h")
+        with self.assertRaises(ValueError):
+            self.test_series.iter_line_protocol(precision="h")
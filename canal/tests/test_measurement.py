@@ -1,7 +1,10 @@
 import datetime
+import os
+import tempfile
 import unittest
 
 import numpy as np
+import pandas as pd
 import pytz
 
 import canal as canal
@@ -65,7 +68,7 @@ class MeasurementTestCase(NumpyTestCase):
             np.array(self.TIME, dtype='datetime64[ns]'),
             test_series.time
         )
-        [self.assertIsNone(x) for x in getattr(test_series, missing_field)]
+        self.assertTrue(pd.isnull(getattr(test_series, missing_field)).all())
         for key, value in test_fields.items():
             self.assertndArrayEqual(value, getattr(test_series, key))
         for key, value in self.TAGS.items():
@@ -136,6 +139,89 @@ class MeasurementTestCase(NumpyTestCase):
         )
         self.assertEqual(len(test_series), self.NUM_SAMPLES)
 
+    def test_init_dtypes(self):
+        test_series = self.TestMeasurement(
+            time=self.TIME,
+            **self.FIELDS,
+            **self.TAGS
+        )
+        self.assertEqual(test_series.int_field.dtype, np.int64)
+        self.assertEqual(test_series.float_field.dtype, np.float64)
+        self.assertEqual(test_series.bool_field.dtype, np.bool_)
+        self.assertEqual(test_series.string_field.dtype, object)
+        self.assertEqual(test_series.first_tag.dtype, object)
+
+    def test_init_nulls(self):
+        test_series = self.TestMeasurement(
+            int_field=[1, None],
+            float_field=[None, 2.5],
+            bool_field=[True, None]
+        )
+        self.assertEqual(test_series.int_field.dtype, "Int64")
+        self.assertEqual(list(test_series.int_field.isna()), [False, True])
+        self.assertEqual(test_series.float_field.dtype, np.float64)
+        self.assertTrue(np.isnan(test_series.float_field[0]))
+        self.assertEqual(list(test_series.bool_field), [True, None])
+        self.assertEqual(
+            test_series.to_line_protocol(),
+            "TestMeasurement bool_field=True,int_field=1i \n"
+            "TestMeasurement float_field=2.5 "
+        )
+
+    def test_tags_categorical(self):
+        test_series = self.TestMeasurement(
+            int_field=[1, 2, 3, 4],
+            first_tag=["a b", None, "a b", 1],
+            second_tag="x"
+        )
+        first_tag = test_series.data_frame["first_tag"]
+        self.assertEqual(first_tag.dtype, "category")
+        self.assertEqual(list(first_tag.cat.categories), ["a b", "1"])
+        self.assertEqual(len(test_series.data_frame["second_tag"].cat.categories), 1)
+        self.assertndArrayEqual(
+            test_series.first_tag,
+            np.array(["a b", None, "a b", "1"], dtype=object)
+        )
+        self.assertEqual(
+            test_series.to_line_protocol(),
+            "TestMeasurement,first_tag=a\\ b,second_tag=x int_field=1i \n"
+            "TestMeasurement,second_tag=x int_field=2i \n"
+            "TestMeasurement,first_tag=a\\ b,second_tag=x int_field=3i \n"
+            "TestMeasurement,first_tag=1,second_tag=x int_field=4i "
+        )
+
+    def test_tags_all_null(self):
+        test_series = self.TestMeasurement(
+            int_field=[1, 2],
+            first_tag=[None, None]
+        )
+        self.assertEqual(list(test_series.first_tag), [None, None])
+        self.assertEqual(list(test_series.second_tag), [None, None])
+        self.assertEqual(
+            test_series.to_line_protocol(),
+            "TestMeasurement int_field=1i \nTestMeasurement int_field=2i "
+        )
+
+        # Unset tags are empty categoricals, which are coerced as they are
+        test_series.second_tag = test_series.data_frame["second_tag"].values
+        test_series.first_tag = test_series.first_tag
+        self.assertEqual(list(test_series.first_tag), [None, None])
+        self.assertEqual(list(test_series.second_tag), [None, None])
+
+    def test_init_broadcasts_scalars(self):
+        test_series = self.TestMeasurement(
+            int_field=[1, 2, 3],
+            first_tag="a",
+            time=self.TIME[0]
+        )
+        self.assertEqual(list(test_series.first_tag), 3*["a"])
+        self.assertEqual(len(set(test_series.time)), 1)
+
+    def test_setter_coerces(self):
+        test_series = self.TestMeasurement(int_field=[1, 2])
+        test_series.int_field = [1.0, 2.0]
+        self.assertEqual(test_series.int_field.dtype, np.int64)
+
 
 class TimestampTestCase(NumpyTestCase):
     class TestMeasurement(canal.Measurement):
@@ -226,23 +312,19 @@ class InvalidFieldWithinSeriesTestCase(unittest.TestCase):
         class TestMeasuremement(canal.Measurement):
             float_field = canal.FloatField()
 
-        test_series = TestMeasuremement(
-            float_field=10*["not a float"]
-        )
-
         with self.assertRaises(ValueError):
-            test_series.to_line_protocol()
+            TestMeasuremement(
+                float_field=10*["not a float"]
+            )
 
     def test_invalid_integer(self):
         class TestMeasuremement(canal.Measurement):
             int_field = canal.IntegerField()
 
-        test_series = TestMeasuremement(
-            int_field=10*["not an integer"]
-        )
-
         with self.assertRaises(ValueError):
-            test_series.to_line_protocol()
+            TestMeasuremement(
+                int_field=10*["not an integer"]
+            )
 
 
 class RequiredTestCase(unittest.TestCase):
@@ -291,3 +373,108 @@ class RequiredTestCase(unittest.TestCase):
         )
         with self.assertRaises(canal.MissingTagError):
             test_series.to_line_protocol()
+
+
+class FromRecordsTestCase(NumpyTestCase):
+    class Measurement(canal.Measurement):
+        BACKEND = "numpy"
+        int_field = canal.IntegerField()
+        float_field = canal.FloatField()
+        tag = canal.Tag()
+
+    class FrameMeasurement(Measurement):
+        BACKEND = "pandas"
+
+    DTYPE = np.dtype([
+        ("time", np.int64),
+        ("int_field", np.int64),
+        ("float_field", np.float64),
+        ("tag", "S8")
+    ])
+
+    def make_records(self):
+        records = np.zeros(4, dtype=self.DTYPE)
+        records["time"] = np.arange(4) * 10**9
+        records["int_field"] = np.arange(4)
+        records["float_field"] = np.arange(4) + 0.5
+        records["tag"] = [b"a", b"b", b"a", b"c d"]
+        return records
+
+    def test_from_records(self):
+        records = self.make_records()
+        test_series = self.Measurement.from_records(records)
+
+        self.assertEqual(len(test_series), 4)
+        self.assertTrue(np.shares_memory(test_series.int_field, records))
+        self.assertTrue(np.shares_memory(test_series.float_field, records))
+        self.assertTrue(np.shares_memory(test_series.time, records))
+        self.assertndArrayEqual(
+            test_series.time,
+            (np.arange(4) * 10**9).astype("datetime64[ns]")
+        )
+        self.assertEqual(list(test_series.tag), ["a", "b", "a", "c d"])
+        self.assertEqual(
+            test_series.to_line_protocol().splitlines()[-1],
+            "Measurement,tag=c\\ d float_field=3.5,int_field=3i 3000000000"
+        )
+
+    def test_from_records_pandas(self):
+        test_series = self.FrameMeasurement.from_records(self.make_records())
+        self.assertEqual(
+            test_series.to_line_protocol(),
+            self.Measurement.from_records(self.make_records()).to_line_protocol().replace(
+                "Measurement",
+                "FrameMeasurement"
+            )
+        )
+
+    def test_from_records_memmap(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "records")
+            self.make_records().tofile(path)
+            records = np.memmap(path, dtype=self.DTYPE, mode="r")
+            test_series = self.Measurement.from_records(records)
+            self.assertTrue(np.shares_memory(test_series.int_field, records))
+            self.assertEqual(list(test_series.int_field), [0, 1, 2, 3])
+            del test_series, records
+
+    def test_from_records_unstructured(self):
+        with self.assertRaises(ValueError):
+            self.Measurement.from_records(np.arange(4))
+
+    def test_from_columns(self):
+        columns = dict(
+            int_field=np.arange(4),
+            float_field=np.ones(4),
+            time=np.arange(4).astype("datetime64[ns]")
+        )
+        test_series = self.Measurement.from_columns(columns)
+        for name, values in columns.items():
+            self.assertIs(getattr(test_series, name), values)
+
+    def test_from_columns_unrecognized(self):
+        with self.assertRaises(ValueError):
+            self.Measurement.from_columns(dict(int_fields=np.arange(4)))
+
+    def test_to_columns_unset_tag(self):
+        for measurement_class in (self.Measurement, self.FrameMeasurement):
+            test_series = measurement_class(int_field=[1, 2], float_field=[1.5, 2.5])
+            round_trip = measurement_class.from_columns(test_series.to_columns())
+            self.assertEqual(list(round_trip.tag), [None, None])
+            self.assertEqual(
+                round_trip.to_line_protocol(),
+                test_series.to_line_protocol()
+            )
+
+    def test_to_columns(self):
+        for measurement_class in (self.Measurement, self.FrameMeasurement):
+            test_series = measurement_class.from_records(self.make_records())
+            columns = test_series.to_columns()
+            self.assertEqual(tuple(columns), measurement_class.schema.columns)
+
+            columns["float_field"][0] = 10.5
+            self.assertEqual(test_series.float_field[0], 10.5)
+            self.assertEqual(
+                measurement_class.from_columns(columns).to_line_protocol(),
+                test_series.to_line_protocol()
+            )
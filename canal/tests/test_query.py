@@ -153,3 +153,28 @@ class MakeQueryStringTestCase(unittest.TestCase):
             self.Fixture.make_query_string(
                 float_field__abcd=5
             )
+
+
+class MakeQueryParamsTestCase(unittest.TestCase):
+    class Fixture(canal.Measurement):
+        int_field = canal.IntegerField()
+        test_tag = canal.Tag()
+
+    def test_make_query_params(self):
+        self.assertEqual(
+            self.Fixture.make_query_params(limit=10),
+            dict(q="SELECT int_field,test_tag FROM Fixture LIMIT 10")
+        )
+
+    def test_epoch(self):
+        self.assertEqual(
+            self.Fixture.make_query_params(epoch="ms", test_tag="a"),
+            dict(
+                q="SELECT int_field,test_tag FROM Fixture WHERE test_tag = 'a'",
+                epoch="ms"
+            )
+        )
+
+    def test_invalid_epoch(self):
+        with self.assertRaises(ValueError):
+            self.Fixture.make_query_params(epoch="h")
@@ -0,0 +1,93 @@
+import pickle
+import unittest
+
+import numpy as np
+
+import canal
+from canal.schema import Schema
+
+
+class SchemaTestCase(unittest.TestCase):
+    class Parent(canal.Measurement):
+        int_field = canal.IntegerField()
+        float_field = canal.FloatField(db_name="float")
+        tag = canal.Tag()
+
+    class Child(Parent):
+        string_field = canal.StringField()
+        tag = canal.Tag(db_name="renamed_tag")
+
+    def test_schema(self):
+        schema = self.Parent.schema
+        self.assertIsInstance(schema, Schema)
+        self.assertEqual(schema.name, "Parent")
+        self.assertEqual(list(schema.tags), ["tag"])
+        self.assertEqual(list(schema.fields), ["float_field", "int_field"])
+        self.assertEqual(
+            list(schema.tags_and_fields),
+            ["float_field", "int_field", "tag"]
+        )
+        self.assertEqual(
+            dict(schema.db_names),
+            dict(float_field="float", int_field="int_field", tag="tag")
+        )
+        self.assertEqual(
+            schema.columns,
+            ("tag", "float_field", "int_field", "time")
+        )
+        self.assertEqual(schema.dtypes["int_field"], np.int64)
+        self.assertEqual(schema.dtypes["float_field"], np.float64)
+        self.assertEqual(schema.dtypes["tag"], np.object_)
+
+    def test_resolve(self):
+        attname, datum = self.Parent.schema.resolve("float")
+        self.assertEqual(attname, "float_field")
+        self.assertIsInstance(datum, canal.FloatField)
+        with self.assertRaises(ValueError):
+            self.Parent.schema.resolve("float_field")
+
+    def test_subclass_schema(self):
+        self.assertEqual(
+            list(self.Child.schema.tags_and_fields),
+            ["float_field", "int_field", "string_field", "tag"]
+        )
+        self.assertEqual(self.Child.schema.db_names["tag"], "renamed_tag")
+        self.assertEqual(
+            list(self.Child.tags_and_fields),
+            list(self.Child.schema.tags_and_fields)
+        )
+
+        # The parent's schema is unaffected by its subclass
+        self.assertEqual(self.Parent.schema.db_names["tag"], "tag")
+        self.assertNotIn("string_field", self.Parent.tags_and_fields)
+        self.assertNotIn("string_field", self.Parent.fields_by_attname)
+
+    def test_redefine_tag_as_field(self):
+        class Subclass(self.Parent):
+            tag = canal.StringField()
+
+        self.assertEqual(list(Subclass.schema.tags), [])
+        self.assertIn("tag", Subclass.schema.fields)
+
+    def test_immutable(self):
+        schema = self.Parent.schema
+        with self.assertRaises(AttributeError):
+            schema.name = "Other"
+        with self.assertRaises(TypeError):
+            schema.tags["other"] = canal.Tag()
+
+    def test_pickle(self):
+        schema = pickle.loads(pickle.dumps(self.Child.schema))
+        self.assertEqual(schema.name, "Child")
+        self.assertEqual(
+            dict(schema.db_names),
+            dict(self.Child.schema.db_names)
+        )
+
+    def test_field_named_schema(self):
+        class Measurement(canal.Measurement):
+            schema = canal.StringField()
+
+        self.assertIsInstance(Measurement.schema, Schema)
+        measurement = Measurement(schema=["a"], time=[0])
+        self.assertEqual(list(measurement.schema), ["a"])
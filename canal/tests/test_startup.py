@@ -0,0 +1,80 @@
+import os
+import subprocess
+import sys
+import unittest
+
+import canal as canal
+
+#: Modules which `import canal` must leave to the code paths which need them
+LAZY_MODULES = ("pandas", "pytz")
+
+#: A generous bound on the time `import canal` takes, NumPy included
+MAX_IMPORT_SECONDS = 1.0
+
+
+def run_python(*args):
+    return subprocess.run(
+        [sys.executable] + list(args),
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(canal.__file__))),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True
+    )
+
+
+class StartupTestCase(unittest.TestCase):
+    def test_lazy_modules(self):
+        modules = run_python(
+            "-c",
+            "import sys, canal; print('\\n'.join(sys.modules))"
+        ).stdout.split()
+        for name in LAZY_MODULES:
+            self.assertNotIn(name, modules)
+
+    def test_numpy_backend(self):
+        # Enough rows for tags to be grouped before serializing
+        modules = run_python("-c", "\n".join([
+            "import sys, canal, numpy as np",
+            "class Measurement(canal.Measurement):",
+            "    BACKEND = 'numpy'",
+            "    int_field = canal.IntegerField()",
+            "    tag = canal.Tag()",
+            "n = 2 * canal.line_protocol.GROUP_MIN_ROWS",
+            "Measurement(int_field=np.arange(n), tag=(np.arange(n) % 3).astype(str)).to_line_protocol()",
+            "print('\\n'.join(sys.modules))"
+        ])).stdout.split()
+        self.assertNotIn("pandas", modules)
+
+    def test_numpy_backend_from_json(self):
+        # Grouped tags are decoded without pandas too
+        modules = run_python("-c", "\n".join([
+            "import sys, canal",
+            "class Measurement(canal.Measurement):",
+            "    BACKEND = 'numpy'",
+            "    int_field = canal.IntegerField()",
+            "    tag = canal.Tag()",
+            "content = dict(series=[",
+            "    dict(name='Measurement', tags=dict(tag=tag), columns=['time', 'int_field'],",
+            "         values=[['2015-01-29T21:55:43Z', 1]])",
+            "    for tag in ('a', 'b', '')",
+            "])",
+            "assert list(Measurement.from_json(content).tag) == ['a', 'b', None]",
+            "Measurement.from_json_many(content)",
+            "print('\\n'.join(sys.modules))"
+        ])).stdout.split()
+        self.assertNotIn("pandas", modules)
+
+    @unittest.skipIf(sys.version_info < (3, 7), "-X importtime requires Python 3.7")
+    def test_import_time(self):
+        # Each line reads "import time: self [us] | cumulative | package"
+        cumulative = {}
+        for line in run_python("-X", "importtime", "-c", "import canal").stderr.splitlines():
+            if not line.startswith("import time:") or "cumulative" in line:
+                continue
+            _, microseconds, name = line.split("|")
+            cumulative[name.strip()] = int(microseconds)
+
+        for name in LAZY_MODULES:
+            self.assertNotIn(name, cumulative)
+        self.assertLess(cumulative["canal"] / 1e6, MAX_IMPORT_SECONDS)
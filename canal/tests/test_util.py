@@ -0,0 +1,136 @@
+import numpy as np
+
+from canal import util
+
+from .util import NumpyTestCase
+
+
+class DatetimeFromInfluxTimesTestCase(NumpyTestCase):
+    def test_nanosecond_precision(self):
+        self.assertndArrayEqual(
+            util.datetime64_from_influx_times([
+                "2015-01-29T21:55:43.702900257Z",
+                "2015-01-29T21:55:43.702900258Z"
+            ]),
+            np.array(
+                [
+                    "2015-01-29T21:55:43.702900257",
+                    "2015-01-29T21:55:43.702900258"
+                ],
+                dtype="datetime64[ns]"
+            )
+        )
+
+    def test_variable_fraction(self):
+        self.assertndArrayEqual(
+            util.datetime64_from_influx_times([
+                "2015-01-29T21:55:43Z",
+                "2015-01-29T21:55:43.7Z",
+                "2015-01-29T21:55:43.702Z",
+                "2015-01-29T21:55:43.7029Z",
+                "2015-01-29T21:55:43.702900257Z"
+            ]),
+            np.array(
+                [
+                    "2015-01-29T21:55:43",
+                    "2015-01-29T21:55:43.7",
+                    "2015-01-29T21:55:43.702",
+                    "2015-01-29T21:55:43.7029",
+                    "2015-01-29T21:55:43.702900257"
+                ],
+                dtype="datetime64[ns]"
+            )
+        )
+
+    def test_utc_offsets(self):
+        self.assertndArrayEqual(
+            util.datetime64_from_influx_times([
+                "2015-01-29T23:55:43.5+02:00",
+                "2015-01-29T13:25:43-08:30",
+                "2015-01-29T21:55:43+00:00"
+            ]),
+            np.array(
+                [
+                    "2015-01-29T21:55:43.5",
+                    "2015-01-29T21:55:43",
+                    "2015-01-29T21:55:43"
+                ],
+                dtype="datetime64[ns]"
+            )
+        )
+
+    def test_dates(self):
+        self.assertndArrayEqual(
+            util.datetime64_from_influx_times([
+                "2016-02-29T00:00:00Z",
+                "2000-02-29T00:00:00Z",
+                "1969-12-31T23:59:59.999999999Z",
+                "2262-04-11T23:47:16.854775807Z"
+            ]),
+            np.array(
+                [
+                    "2016-02-29",
+                    "2000-02-29",
+                    "1969-12-31T23:59:59.999999999",
+                    "2262-04-11T23:47:16.854775807"
+                ],
+                dtype="datetime64[ns]"
+            )
+        )
+
+    def test_nulls(self):
+        times = util.datetime64_from_influx_times(
+            [None, "2015-01-29T21:55:43Z"]
+        )
+        self.assertTrue(np.isnat(times[0]))
+        self.assertEqual(
+            times[1],
+            np.datetime64("2015-01-29T21:55:43", "ns")
+        )
+
+    def test_empty(self):
+        times = util.datetime64_from_influx_times([])
+        self.assertEqual(times.dtype, np.dtype("datetime64[ns]"))
+        self.assertEqual(len(times), 0)
+
+    def test_invalid(self):
+        for time in [
+            "2015-01-29 21:55:43Z",
+            "2015-01-29T21:55:43",
+            "2015-01-29T21:55:43.Z",
+            "2015-01-29T21:55:43.1234567890Z",
+            "2015-01-29T21:55:43Zjunk",
+            "2015-01-29T21:55:43+0100",
+            "2015-02-29T21:55:43Z",
+            "2015-13-29T21:55:43Z",
+            "2015-01-29T24:55:43Z",
+            "2015-01-29",
+            "2015-01-29T21:55:43éZ",
+        ]:
+            with self.assertRaises(ValueError, msg=time):
+                util.datetime64_from_influx_times(
+                    ["2015-01-29T21:55:43Z", time]
+                )
+
+
+    def test_out_of_range(self):
+        for time in [
+            "2300-01-01T00:00:00Z",
+            "1600-01-01T00:00:00Z",
+            "0001-01-01T00:00:00Z",
+            "2262-04-11T23:47:16.854775808Z",
+            "1677-09-21T00:12:43.145224192Z",
+            "2262-04-11T23:00:00-01:00",
+        ]:
+            with self.assertRaises(ValueError, msg=time):
+                util.datetime64_from_influx_times([time])
+
+    def test_range_bounds(self):
+        self.assertndArrayEqual(
+            util.datetime64_from_influx_times([
+                "1677-09-21T00:12:43.145224193Z",
+                "2262-04-11T23:47:16.854775807Z",
+                "2262-04-12T00:00:00+01:00",
+            ]).view(np.int64),
+            np.array([-(2**63 - 1), 2**63 - 1, 9223369200000000000])
+        )
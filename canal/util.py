@@ -1,7 +1,48 @@
 import datetime
+import importlib
 import re
 
-import pytz
+import numpy as np
+
+
+class LazyModule(object):
+    """
+    Stands in for a module, which is only imported once one of its attributes
+    is first accessed.  This keeps heavy dependencies which only some code
+    paths need, i.e. pandas and pytz, out of `import canal`
+    """
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attribute):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attribute)
+
+
+pytz = LazyModule("pytz")
+
+
+#: The number of nanoseconds within a unit of each InfluxDB time precision
+PRECISIONS = dict(
+    ns=1,
+    u=10**3,
+    ms=10**6,
+    s=10**9
+)
+
+
+def nanoseconds_per(precision):
+    """
+    Returns the number of nanoseconds within a unit of an InfluxDB time
+    precision, i.e. one of "ns", "u", "ms" or "s"
+    """
+    try:
+        return PRECISIONS[precision]
+    except KeyError:
+        raise ValueError("Unrecognized time precision {}".format(precision))
 
 
 _influx_time_format = re.compile(
@@ -21,4 +62,151 @@ def datetime_from_influx_time(string):
             tzinfo=pytz.UTC
         )
     else:
-        raise ValueError("Could not parse time string")
\ No newline at end of file
+        raise ValueError("Could not parse time string")
+
+_zero, _nine = ord("0"), ord("9")
+#: The range of `datetime64[ns]`, split into seconds and nanoseconds
+_min_seconds, _min_fraction = divmod(-(2**63 - 1), 10**9)
+_max_seconds, _max_fraction = divmod(2**63 - 1, 10**9)
+_fraction_scale = 10**np.arange(8, -1, -1, dtype=np.int64)
+_days_in_month = np.array([0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])
+
+
+def _days_from_civil(year, month, day):
+    """
+    Returns the number of days between 1970-01-01 and each proleptic
+    Gregorian date, computed over integer arrays
+    """
+    year = year - (month <= 2)
+    era = year // 400
+    year_of_era = year - era * 400
+    day_of_year = (153 * (month + np.where(month > 2, -3, 9)) + 2) // 5 + day - 1
+    day_of_era = (
+        year_of_era * 365 + year_of_era // 4 - year_of_era // 100 + day_of_year
+    )
+    return era * 146097 + day_of_era - 719468
+
+
+def datetime64_from_influx_times(values):
+    """
+    Parses a column of RFC3339 timestamps, as returned by InfluxDB, into
+    `datetime64[ns]` without loss of precision.  The fractional seconds may
+    hold anywhere from zero to nine digits, and the timestamps may end with
+    either `Z` or a `+HH:MM`/`-HH:MM` UTC offset.  `None` values become `NaT`
+
+    :param values: A sequence or array of timestamp strings
+    :return: A `numpy.ndarray` of `datetime64[ns]`, in UTC
+    """
+    if not isinstance(values, np.ndarray):
+        values = np.array(values, dtype=object)
+    nulls = None
+    if values.dtype == object:
+        nulls = np.equal(values, None)
+        if nulls.any():
+            values = values.copy()
+            values[nulls] = "1970-01-01T00:00:00Z"
+        else:
+            nulls = None
+    try:
+        values = values.astype(np.bytes_)
+    except UnicodeEncodeError:
+        raise ValueError("Could not parse time string")
+    num_rows = len(values)
+    if not num_rows:
+        return np.array([], dtype="datetime64[ns]")
+
+    # Work on the raw characters as a 2D array of digit values, padded with
+    # NULs so the fraction and UTC offset can be gathered at fixed offsets
+    # past their variable starting position.  Subtracting "0" wraps every
+    # non-digit character to a value of 10 or more.
+    width = values.dtype.itemsize
+    digits = np.zeros((num_rows, max(width, 30) + 7), dtype=np.uint8)
+    digits[:, :width] = values.view(np.uint8).reshape(num_rows, width)
+    digits -= _zero
+    rows = np.arange(num_rows)
+
+    def is_character(column, character):
+        return digits[:, column] == (ord(character) - _zero) % 256
+
+    def number(start, length):
+        result = digits[:, start].astype(np.int64)
+        for column in range(start + 1, start + length):
+            result *= 10
+            result += digits[:, column]
+        return result
+
+    valid = (
+        (digits[:, [0, 1, 2, 3, 5, 6, 8, 9, 11, 12, 14, 15, 17, 18]] < 10).all(axis=1) &
+        is_character(4, "-") & is_character(7, "-") & is_character(10, "T") &
+        is_character(13, ":") & is_character(16, ":")
+    )
+    year, month, day = number(0, 4), number(5, 2), number(8, 2)
+    hour, minute, second = number(11, 2), number(14, 2), number(17, 2)
+
+    # Fractional seconds: a "." followed by the leading run of digits
+    has_fraction = is_character(19, ".")
+    fraction_digits = (
+        np.logical_and.accumulate(digits[:, 20:30] < 10, axis=1) &
+        has_fraction[:, None]
+    )
+    num_fraction_digits = fraction_digits.sum(axis=1)
+    fraction = np.dot(
+        np.where(fraction_digits[:, :9], digits[:, 20:29], 0),
+        _fraction_scale
+    )
+    valid &= ~has_fraction | (
+        (num_fraction_digits > 0) & (num_fraction_digits <= 9)
+    )
+
+    # UTC offset: "Z", "+HH:MM" or "-HH:MM"
+    zone = 19 + has_fraction + num_fraction_digits
+    designator = digits[rows, zone] + _zero
+    is_utc = designator == ord("Z")
+    has_offset = (designator == ord("+")) | (designator == ord("-"))
+    offset = digits[rows[:, None], zone[:, None] + np.arange(1, 6)]
+    valid &= is_utc | (
+        has_offset &
+        (offset[:, [0, 1, 3, 4]] < 10).all(axis=1) &
+        (offset[:, 2] == ord(":") - _zero)
+    )
+    end = zone + np.where(is_utc, 1, 6)
+    valid &= digits[rows, end] == (-_zero) % 256
+
+    is_leap_year = (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+    days_in_month = (
+        _days_in_month[np.clip(month, 0, 12)] + ((month == 2) & is_leap_year)
+    )
+    valid &= (
+        (month >= 1) & (month <= 12) &
+        (day >= 1) & (day <= days_in_month) &
+        (hour < 24) & (minute < 60) & (second < 60)
+    )
+
+    # Seconds can't overflow, so the range of `datetime64[ns]` (bar NaT, the
+    # minimum int64) is checked before scaling them into nanoseconds
+    seconds = _days_from_civil(year, month, day) * 86400
+    seconds += hour * 3600 + minute * 60 + second
+    if has_offset.any():
+        offset = offset.astype(np.int64)
+        offset_minutes = (
+            (offset[:, 0] * 10 + offset[:, 1]) * 60 +
+            offset[:, 3] * 10 + offset[:, 4]
+        )
+        sign = np.where(designator == ord("-"), -1, 1)
+        seconds -= np.where(has_offset, sign * offset_minutes * 60, 0)
+    valid &= (
+        ((seconds > _min_seconds) | ((seconds == _min_seconds) & (fraction >= _min_fraction))) &
+        ((seconds < _max_seconds) | ((seconds == _max_seconds) & (fraction <= _max_fraction)))
+    )
+
+    if not valid.all():
+        raise ValueError(
+            "Could not parse time string {}".format(
+                values[np.argmin(valid)].decode()
+            )
+        )
+    nanoseconds = seconds * 10**9 + fraction
+    times = nanoseconds.view("datetime64[ns]")
+    if nulls is not None:
+        times[nulls] = np.datetime64("NaT")
+    return times
@@ -11,6 +11,9 @@ reqs = [str(ir.req) for ir in install_reqs]
 setup(
     name='canal',
     install_requires=reqs,
+    extras_require={
+        "msgpack": ["msgpack"]
+    },
     packages=find_packages(),
     version="0.1.0"
 )